@@ -513,11 +513,41 @@ def analyze(ctx: Context, directory: Optional[str], verbose: int) -> None:
         sys.exit(1)
 
 
-def main() -> None:
-    """Main entry point."""
-    # Add command aliases
+def _add_aliases() -> None:
+    """Add command aliases."""
     cli.aliases["up"] = "update"
     cli.aliases["st"] = "status"
+
+
+def run(argv: List[str], cwd: Optional[str] = None) -> int:
+    """Run the CLI in-process and return its exit code.
+
+    Unlike main(), this never exits the interpreter, and the working
+    directory is restored afterwards even if a command changes it.
+    """
+    _add_aliases()
+    orig_cwd = os.getcwd()
+    try:
+        if cwd:
+            os.chdir(cwd)
+        cli.main(args=argv, obj={}, standalone_mode=False)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        return 1
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        return 1
+    finally:
+        os.chdir(orig_cwd)
+
+
+def main() -> None:
+    """Main entry point."""
+    _add_aliases()
     cli(obj={})
 
 
@@ -6,7 +6,7 @@ import uuid
 import logging
 import time
 import shlex
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import git
 from git.exc import GitCommandError, InvalidGitRepositoryError
 from ..typing import CommitID, GitInterface, Commit
@@ -219,6 +219,31 @@ def branch_name_from_commit(config: PysprConfig, commit: Commit) -> str:
     prefix = config.repo.branch_prefix
     return f"{prefix}{commit.commit_id}"
 
+# Commands whose output depends only on repository state, so they can be memoized
+# until the next write (see CachingGit.must_git).
+READ_ONLY_COMMANDS = ("rev-parse", "log", "show", "diff-tree", "for-each-ref", "cat-file")
+
+def _repo_state_stamp(git_dir: str, common_dir: str) -> Tuple[Tuple[int, int, int], ...]:
+    """Cheap fingerprint of HEAD moves and packed refs, to catch writes made by other processes.
+
+    Stats a fixed handful of files rather than walking refs/: HEAD and its
+    reflog in both the worktree's git dir and the common dir (so a commit
+    from the main checkout shows up in a linked worktree), packed-refs and
+    FETCH_HEAD. Writes that touch none of these are expected to go through
+    the caller's invalidate().
+    """
+    paths = {os.path.join(git_dir, "HEAD"), os.path.join(git_dir, "logs", "HEAD"),
+             os.path.join(common_dir, "HEAD"), os.path.join(common_dir, "logs", "HEAD"),
+             os.path.join(common_dir, "packed-refs"), os.path.join(git_dir, "FETCH_HEAD")}
+    stamp: List[Tuple[int, int, int]] = []
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
 class RealGit:
     """Real Git implementation."""
     def __init__(self, config: PysprConfig):
@@ -361,6 +386,110 @@ class RealGit:
             raise Exception(f"Git command failed after {max_retries} attempts: {str(last_exception)}")
         raise Exception("Unexpected error in git command")
 
+    def rev_parse_many(self, *revs: str) -> List[str]:
+        """Resolve several revisions with a single `git rev-parse` call."""
+        output = self.must_git("rev-parse " + " ".join(shlex.quote(rev) for rev in revs))
+        return output.strip().split("\n")
+
+    def short(self, command: str) -> str:
+        """Run a git command that prints a single line and return it stripped."""
+        result = self.must_git(command).strip()
+        assert "\n" not in result, f"Expected single-line output from git {command}"
+        return result
+
+    def batch_read_commits(self, revs: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Resolve revisions to (sha, full commit message) in one pass.
+
+        All lookups go through one persistent `git cat-file --batch` process
+        instead of a `rev-parse` plus `git show` per revision. Revisions that
+        don't resolve are left out.
+        """
+        commits: Dict[str, Tuple[str, str]] = {}
+        if not revs:
+            return commits
+        repo = git.Repo(os.getcwd(), search_parent_directories=True)
+        try:
+            for rev in revs:
+                try:
+                    sha, _type, _size, data = repo.git.get_object_data(rev)
+                except ValueError:
+                    continue
+                raw = data.decode("utf-8", errors="replace")
+                # Commit objects are headers, a blank line, then the message
+                message = raw.split("\n\n", 1)[1] if "\n\n" in raw else ""
+                # GitPython hands the sha back as bytes despite its annotation
+                commits[rev] = (os.fsdecode(sha), message)
+        finally:
+            repo.close()
+        return commits
+
+    def batch_show_messages(self, hashes: List[str]) -> Dict[str, str]:
+        """Get full commit messages (like show -s --format=%B) for many commits."""
+        return {rev: message for rev, (_sha, message) in self.batch_read_commits(hashes).items()}
+
     def must_git(self, command: str, output: Optional[str] = None) -> str:
         """Run git command, failing on error."""
         return self.run_cmd(command, output)
+
+
+class CachingGit(RealGit):
+    """RealGit that memoizes read-only lookups between writes.
+
+    Opt-in for callers like the e2e helpers that repeat the same rev-parse/log
+    lookups many times; plain RealGit always runs git. Writes run through this
+    object drop the cache; callers that write behind its back (e.g. by running
+    pyspr) call invalidate().
+    """
+    def __init__(self, config: PysprConfig):
+        super().__init__(config)
+        self._cache: Dict[Tuple[str, str, Optional[str]], Tuple[Tuple[Tuple[int, int, int], ...], str]] = {}
+        # (git dir, common dir) per working directory, so each lookup doesn't
+        # have to open a git.Repo
+        self._git_dirs: Dict[str, Optional[Tuple[str, str]]] = {}
+
+    def invalidate(self) -> None:
+        """Forget all memoized output."""
+        self._cache.clear()
+
+    def run_cmd(self, command: str, output: Optional[str] = None) -> str:
+        """Run git command, dropping the cache if it may move HEAD or refs."""
+        if command.strip().split(" ", 1)[0] not in READ_ONLY_COMMANDS:
+            self.invalidate()
+        return super().run_cmd(command, output)
+
+    def _git_dirs_for(self, cwd: str) -> Optional[Tuple[str, str]]:
+        if cwd not in self._git_dirs:
+            try:
+                repo = git.Repo(cwd, search_parent_directories=True)
+            except (InvalidGitRepositoryError, git.NoSuchPathError):
+                self._git_dirs[cwd] = None
+            else:
+                self._git_dirs[cwd] = (str(repo.git_dir), str(repo.common_dir))
+                repo.close()
+        return self._git_dirs[cwd]
+
+    def must_git(self, command: str, output: Optional[str] = None) -> str:
+        """Run git command, failing on error.
+
+        Read-only lookups (rev-parse, log, ...) are memoized until the next
+        write or invalidate(), so repeated SHA lookups between writes don't
+        spawn another git process. A cheap stamp of HEAD and packed-refs also
+        catches most writes made by other git processes.
+        """
+        cmd_str = command.strip()
+        if cmd_str.split(" ", 1)[0] not in READ_ONLY_COMMANDS:
+            return self.run_cmd(command, output)
+
+        cwd = os.getcwd()
+        dirs = self._git_dirs_for(cwd)
+        if dirs is None:
+            return self.run_cmd(command, output)
+        stamp = _repo_state_stamp(*dirs)
+        key = (cwd, cmd_str, output)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            logger.debug(f"Cached git {cmd_str}")
+            return cached[1]
+        result = self.run_cmd(command, output)
+        self._cache[key] = (stamp, result)
+        return result
@@ -3,13 +3,13 @@
 import os
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Literal, Protocol, runtime_checkable, TypeVar
+from typing import Dict, List, Optional, Literal, Protocol, cast, runtime_checkable, TypeVar
 import re
 
 from ..util import ensure
 from .types import (
     GraphQLResponseType, GitHubRequester,
-    parse_graphql_response
+    parse_graphql_response, parse_review_requests_response
 )
 from ..git import Commit, GitInterface
 from ..config.models import PysprConfig
@@ -35,6 +35,7 @@ class PullRequest:
     body: str = ""
     title: str = ""
     merged: bool = False  # Added to track merge status
+    head_oid: Optional[str] = None  # Tip of from_branch on GitHub
 
     def mergeable(self, config: PysprConfig) -> bool:
         """Check if PR is mergeable."""
@@ -321,8 +322,6 @@ class GitHubClient:
             logger.warning("No GitHub client provided - operations will fail")
         self._repo: Optional[GitHubRepoProtocol] = None
 
-
-
     @property
     def repo(self) -> Optional[GitHubRepoProtocol]:
         """Get GitHub repository."""
@@ -357,6 +356,35 @@ class GitHubClient:
         if not self.repo:
             return GitHubInfo(local_branch, [])
             
+        pull_request_map = self._pull_request_map()
+
+        # Build PR stack like Go version
+        pull_requests: List[PullRequest] = []
+
+        # Find top PR
+        for commit in reversed(local_commits):
+            curr_pr = pull_request_map.get(commit.commit_id)
+            if curr_pr:
+                logger.debug(f"Found PR #{curr_pr.number} with commit ID {commit.commit_id}")
+                pull_requests.insert(0, curr_pr)
+
+        logger.debug(f"Final PR stack has {len(pull_requests)} PRs")
+        final_prs = list(pull_requests)  # Make copy to avoid type issues
+        for pr in final_prs:
+            logger.debug(f"  PR #{pr.number}: commit={pr.commit.commit_id} base={pr.base_ref}")
+                
+        return GitHubInfo(local_branch, final_prs)
+
+    def get_open_pull_requests(self, git_cmd: GitInterface) -> List[PullRequest]:
+        """Get all open pyspr PRs, including ones whose commits aren't in the local stack.
+
+        Comes from the same search as get_info, which GitHub already narrows
+        to this user's open PRs in the configured repo.
+        """
+        return sorted(self._pull_request_map().values(), key=lambda pr: pr.number)
+
+    def _pull_request_map(self) -> Dict[str, PullRequest]:
+        """Fetch open pyspr PRs keyed by commit ID with one GraphQL search."""
         # Use GraphQL to efficiently get all data in one query, matching Go behavior
         query = """
         query Query($searchQuery: String!) {
@@ -374,6 +402,7 @@ class GitHubClient:
                 body
                 baseRefName
                 headRefName
+                headRefOid
                 mergeable
                 reviewDecision
                 repository {
@@ -424,7 +453,6 @@ class GitHubClient:
         }
 
         # Single query (no pagination for now)
-        from typing import cast
         # Access private requester - need cast since it's not part of the protocol
         req = cast(GitHubRequester, getattr(self.client, '_Github__requester'))
 
@@ -505,7 +533,8 @@ class GitHubClient:
                                 assert commit is not None
                                 pr = PullRequest(number, commit, all_commits,
                                               base_ref=base_ref, from_branch=from_branch,
-                                              in_queue=in_queue, title=title, body=body)
+                                              in_queue=in_queue, title=title, body=body,
+                                              head_oid=pr_data.headRefOid)
 
                                 # Add PR to map regardless of local commits to follow chain
                                 logger.debug(f"Adding PR #{number} to map with commit ID {commit_id}")
@@ -523,22 +552,7 @@ class GitHubClient:
                     logger.error(f"GraphQL query failed after {max_retries} attempts: {e}")
                     raise
 
-        # Build PR stack like Go version
-        pull_requests: List[PullRequest] = []
-
-        # Find top PR
-        for commit in reversed(local_commits):
-            curr_pr = pull_request_map.get(commit.commit_id)
-            if curr_pr:
-                logger.debug(f"Found PR #{curr_pr.number} with commit ID {commit.commit_id}")
-                pull_requests.insert(0, curr_pr)
-
-        logger.debug(f"Final PR stack has {len(pull_requests)} PRs")
-        final_prs = list(pull_requests)  # Make copy to avoid type issues
-        for pr in final_prs:
-            logger.debug(f"  PR #{pr.number}: commit={pr.commit.commit_id} base={pr.base_ref}")
-                
-        return GitHubInfo(local_branch, final_prs)
+        return pull_request_map
 
     def create_pull_request(self, ctx: StackedPRContextType, git_cmd: GitInterface, info: GitHubInfo,
                          commit: Commit, prev_commit: Optional[Commit], 
@@ -720,6 +734,64 @@ class GitHubClient:
             logger.error(f"Failed to add reviewers to PR #{pr.number}: {e}")
             raise
 
+    def get_review_requests_for_prs(self, numbers: List[int]) -> Dict[int, List[str]]:
+        """Get requested reviewer logins (lowercased) for several PRs in one GraphQL query.
+
+        Replaces a get_pull + get_review_requests round-trip pair per PR.
+        Each PR is looked up by number, so every requested number is in the
+        result; raises ValueError if one doesn't exist.
+        """
+        if not self.repo or not numbers:
+            return {}
+
+        pr_fields = """
+              number
+              reviewRequests(first: 20) {
+                nodes {
+                  requestedReviewer {
+                    ... on User {
+                      login
+                    }
+                  }
+                }
+              }
+        """
+        aliases = "".join(f"pr{number}: pullRequest(number: {number}) {{{pr_fields}}}\n"
+                          for number in dict.fromkeys(numbers))
+        query = f"""
+        query Query($owner: String!, $name: String!) {{
+          repository(owner: $owner, name: $name) {{
+            {aliases}
+          }}
+        }}
+        """
+
+        logger.info(f"> github fetch review requests {numbers}")
+        # Access private requester - need cast since it's not part of the protocol
+        req = cast(GitHubRequester, getattr(self.client, '_Github__requester'))
+        _headers, resp = req.requestJsonAndCheck(
+            "POST",
+            "https://api.github.com/graphql",
+            input={
+                "query": query,
+                "variables": {
+                    "owner": self.config.repo.github_repo_owner,
+                    "name": self.config.repo.github_repo_name,
+                }
+            }
+        )
+
+        nodes = parse_review_requests_response(resp).data.repository
+        reviewers: Dict[int, List[str]] = {}
+        for number in numbers:
+            node = nodes.get(f"pr{number}")
+            if node is None:
+                raise ValueError(f"PR #{number} not found in review request lookup")
+            reviewers[number] = [
+                r.requestedReviewer.login.lower() for r in node.reviewRequests.nodes
+                if r.requestedReviewer and r.requestedReviewer.login]
+        return reviewers
+
     def comment_pull_request(self, ctx: StackedPRContextType, pr: PullRequest, comment: str) -> None:
         """Comment on pull request."""
         if not self.repo:
@@ -22,6 +22,7 @@ class PRNode(BaseModel):
     body: str
     baseRefName: str
     headRefName: str
+    headRefOid: Optional[str] = None
     mergeable: Optional[str] = None
     commits: PRCommits
 
@@ -54,6 +55,28 @@ class GraphQLResponse(BaseModel):
     data: GraphQLData
     errors: Optional[List[GraphQLError]] = None
 
+# Review-request lookup (GitHubClient.get_review_requests_for_prs)
+class RequestedReviewer(BaseModel):
+    login: Optional[str] = None  # Teams have no login
+
+class ReviewRequestNode(BaseModel):
+    requestedReviewer: Optional[RequestedReviewer] = None
+
+class ReviewRequests(BaseModel):
+    nodes: List[ReviewRequestNode]
+
+class PRReviewNode(BaseModel):
+    number: int
+    reviewRequests: ReviewRequests
+
+class ReviewRequestsData(BaseModel):
+    # Keyed by the "pr<number>" alias; None when no such PR exists
+    repository: Dict[str, Optional[PRReviewNode]]
+
+class ReviewRequestsResponse(BaseModel):
+    data: ReviewRequestsData
+    errors: Optional[List[GraphQLError]] = None
+
 # Type for PyGithub GraphQL response
 # First element is headers dict, second is the response data
 GraphQLResponseType = Tuple[Dict[str, object], Dict[str, object]]
@@ -85,6 +108,13 @@ def parse_graphql_response(response: Dict[str, object]) -> GraphQLResponse:
     except Exception as e:
         raise TypeError(f"Invalid GraphQL response: {e}")
 
+def parse_review_requests_response(response: Dict[str, object]) -> ReviewRequestsResponse:
+    """Parse review-requests GraphQL response into Pydantic model."""
+    try:
+        return ReviewRequestsResponse.model_validate(response)
+    except Exception as e:
+        raise TypeError(f"Invalid GraphQL response: {e}")
+
 def parse_pr_node(node: Dict[str, object]) -> Optional[PRNode]:
     """Parse a PR node into Pydantic model."""
     try:
@@ -978,53 +978,66 @@ class StackedPR:
         failed_pushes: List[Tuple[str, str]] = []
         
         if created_branches and not self.pretend:
-            logger.info(f"\nPushing {len(created_branches)} branches to remote...")
+            # Like commit_updated in _do_sync_commit_stack: a branch whose PR
+            # head on GitHub is already the local tip doesn't need pushing
+            pr_heads: Dict[str, str] = {}
+            if github_info:
+                for pr in github_info.pull_requests:
+                    if pr.from_branch and pr.head_oid:
+                        pr_heads[pr.from_branch] = pr.head_oid
+            tips = self.git_cmd.must_git("rev-parse " + " ".join(created_branches)).split()
             ref_names: List[Tuple[str, str]] = []
-            for branch in created_branches:
-                ref_names.append((branch, f"{branch}:refs/heads/{branch}"))
+            for branch, tip in zip(created_branches, tips):
+                if pr_heads.get(branch) == tip:
+                    logger.info(f"  Branch {branch} already pushed")
+                    successfully_pushed.append(branch)
+                else:
+                    ref_names.append((branch, f"{branch}:refs/heads/{branch}"))
+            already_pushed = len(created_branches) - len(ref_names)
+            skipped_note = f", {already_pushed} already pushed" if already_pushed else ""
+            if ref_names:
+                logger.info(f"\nPushing {len(ref_names)} branches to remote...")
             
-            if self.pretend:
-                logger.info("[PRETEND] Would push the following branches:")
-                for branch in created_branches:
-                    logger.info(f"  {branch}")
-            else:
-                # Push branches in batches of 5 (Git's limit)
-                batch_size = 5
-                for i in range(0, len(ref_names), batch_size):
-                    batch = ref_names[i:i + batch_size]
-                    batch_refs = [ref for _, ref in batch]
-                    cmd = f"push --force {self._push_flags()} {remote} " + " ".join(batch_refs)
-                    
-                    try:
-                        self.git_cmd.must_git(cmd)
-                        # If successful, all branches in batch were pushed
-                        for branch, _ in batch:
-                            successfully_pushed.append(branch)
-                        logger.info(f"Pushed batch {i//batch_size + 1}/{(len(ref_names) + batch_size - 1)//batch_size} ({len(batch)} branches)")
-                    except Exception as e:
-                        # If batch fails, try pushing individually to identify which ones fail
-                        logger.warning(f"Batch push failed, trying individually: {str(e)}")
-                        for branch, ref in batch:
-                            try:
-                                self.git_cmd.must_git(f"push --force {self._push_flags()} {remote} {ref}")
-                                successfully_pushed.append(branch)
-                                logger.info(f"  ✓ Pushed {branch}")
-                            except Exception as individual_e:
-                                failed_pushes.append((branch, str(individual_e)))
-                                # Check if it's a merge queue error
-                                if "has been added to a merge queue" in str(individual_e):
-                                    logger.warning(f"  ⚠️  {branch} is in merge queue, skipping update")
-                                else:
-                                    logger.error(f"  ✗ Failed to push {branch}: {individual_e}")
+            # Push branches in batches of 5 (Git's limit)
+            batch_size = 5
+            for i in range(0, len(ref_names), batch_size):
+                batch = ref_names[i:i + batch_size]
+                batch_refs = [ref for _, ref in batch]
+                cmd = f"push --force {self._push_flags()} {remote} " + " ".join(batch_refs)
                 
-                if failed_pushes:
-                    logger.info(f"\nPushed {len(successfully_pushed)} branches successfully, {len(failed_pushes)} failed")
-                else:
-                    logger.info(f"Pushed all {len(created_branches)} branches successfully")
+                try:
+                    self.git_cmd.must_git(cmd)
+                    # If successful, all branches in batch were pushed
+                    for branch, _ in batch:
+                        successfully_pushed.append(branch)
+                    logger.info(f"Pushed batch {i//batch_size + 1}/{(len(ref_names) + batch_size - 1)//batch_size} ({len(batch)} branches)")
+                except Exception as e:
+                    # If batch fails, try pushing individually to identify which ones fail
+                    logger.warning(f"Batch push failed, trying individually: {str(e)}")
+                    for branch, ref in batch:
+                        try:
+                            self.git_cmd.must_git(f"push --force {self._push_flags()} {remote} {ref}")
+                            successfully_pushed.append(branch)
+                            logger.info(f"  ✓ Pushed {branch}")
+                        except Exception as individual_e:
+                            failed_pushes.append((branch, str(individual_e)))
+                            # Check if it's a merge queue error
+                            if "has been added to a merge queue" in str(individual_e):
+                                logger.warning(f"  ⚠️  {branch} is in merge queue, skipping update")
+                            else:
+                                logger.error(f"  ✗ Failed to push {branch}: {individual_e}")
+            
+            pushed = len(successfully_pushed) - already_pushed
+            if failed_pushes:
+                logger.info(f"\nPushed {pushed} branches successfully, {len(failed_pushes)} failed{skipped_note}")
+            elif ref_names:
+                logger.info(f"Pushed all {pushed} changed branches successfully{skipped_note}")
+            else:
+                logger.info(f"All {already_pushed} branches already pushed, nothing to push")
         
         # Update created_branches to only include successfully pushed ones
         if not self.pretend and created_branches:
-            created_branches = successfully_pushed
+            created_branches = [b for b in created_branches if b in successfully_pushed]
         
         # Create or update PRs for each successfully created branch
         if created_branches:
@@ -2,7 +2,10 @@
 
 # These imports are needed for pytest to work properly
 import os
+import shutil
+import tempfile
 import logging
+from typing import List
 # Import pytest for its hooks and Config type
 import pytest
 from pytest import Config
@@ -29,10 +32,78 @@ def _ensure_fixtures_are_used() -> None:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Minimum free space on /dev/shm before test repos are put there
+SHM_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+# Passes the session's tmpfs dir from the pytest (or xdist controller)
+# process to its xdist workers when the controller has loaded this conftest
+SHM_DIR_ENV = "SPR_TEST_SHM_DIR"
+
+def _prune_stale_shm_dirs(shm: str, prefix: str) -> None:
+    """Remove tmpfs test dirs left by pytest sessions that are no longer running.
+    
+    Dirs are named <prefix><pid>-<random>; ones whose pid is still alive
+    belong to another session running as this user and are left alone.
+    """
+    for entry in os.listdir(shm):
+        if not entry.startswith(prefix):
+            continue
+        pid = entry[len(prefix):].split("-", 1)[0]
+        if not pid.isdigit():
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(shm, entry), ignore_errors=True)
+        except PermissionError:
+            pass
+
+def _use_tmpfs_for_test_repos() -> None:
+    """Put test repos on /dev/shm and stop git from fsyncing them.
+    
+    Nothing under the test temp dir has to survive the run, so skip the
+    page-cache writeback and per-object fsyncs git would otherwise pay.
+    Each session gets its own dir, kept for debugging until a later
+    session finds its owner gone.
+    """
+    shm = "/dev/shm"
+    base = os.environ.get(SHM_DIR_ENV)
+    if not base and os.path.isdir(shm) and shutil.disk_usage(shm).free > SHM_MIN_FREE_BYTES:
+        prefix = f"pyspr-tests-{os.getuid()}-"
+        _prune_stale_shm_dirs(shm, prefix)
+        run_uid = os.environ.get("PYTEST_XDIST_TESTRUNUID")
+        if run_uid:
+            # The controller only loads this conftest when it's collected from
+            # here, so workers agree on a dir owned by the controller instead
+            base = os.path.join(shm, f"{prefix}{os.getppid()}-{run_uid}")
+            os.makedirs(base, exist_ok=True)
+        else:
+            base = tempfile.mkdtemp(prefix=f"{prefix}{os.getpid()}-", dir=shm)
+        # xdist workers are spawned after this with a copy of our environment
+        os.environ[SHM_DIR_ENV] = base
+    if base:
+        tempfile.tempdir = base
+        logger.info(f"Using tmpfs for test repos: {base}")
+    if "GIT_CONFIG_COUNT" not in os.environ:
+        os.environ["GIT_CONFIG_COUNT"] = "1"
+        os.environ["GIT_CONFIG_KEY_0"] = "core.fsync"
+        os.environ["GIT_CONFIG_VALUE_0"] = "none"
+
 def pytest_configure(config: Config):
     """Configure pytest."""
+    config.addinivalue_line("markers", "slow: extra coverage skipped unless SPR_E2E_RUNSLOW=true")
+    _use_tmpfs_for_test_repos()
     # Log whether we're using mock or real GitHub based on the actual controlling variable
     if os.environ.get("SPR_USING_MOCK_GITHUB", "").lower() == "false":
         logger.warning("Using REAL GitHub API - tests may be slow or fail with API rate limits")
     else:
-        logger.info("Using MOCK GitHub (default)")
\ No newline at end of file
+        logger.info("Using MOCK GitHub (default)")
+
+def pytest_collection_modifyitems(config: Config, items: List[pytest.Item]) -> None:
+    """Skip tests marked slow unless SPR_E2E_RUNSLOW=true."""
+    if os.environ.get("SPR_E2E_RUNSLOW", "").lower() == "true":
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, set SPR_E2E_RUNSLOW=true to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
@@ -3,15 +3,20 @@
 import os
 import functools
 import logging
-from typing import Callable, TypeVar, Any, cast
+from typing import Callable, TypeVar, Any, Optional, Union, cast, overload
 # pytest import removed as unused
-from pyspr.tests.e2e.test_helpers import RepoContext, run_cmd
+from pyspr.tests.e2e.test_helpers import RepoContext, run_cmds
 
 logger = logging.getLogger(__name__)
 
 F = TypeVar('F', bound=Callable[..., Any])
 
-def run_twice_in_mock_mode(func: F) -> F:
+@overload
+def run_twice_in_mock_mode(func: F) -> F: ...
+@overload
+def run_twice_in_mock_mode(*, read_only: bool = False) -> Callable[[F], F]: ...
+
+def run_twice_in_mock_mode(func: Optional[F] = None, *, read_only: bool = False) -> Union[F, Callable[[F], F]]:
     """Decorator to run a test twice in mock mode, reusing fake GitHub state and git repo.
     
     This decorator:
@@ -19,12 +24,26 @@ def run_twice_in_mock_mode(func: F) -> F:
     2. Runs the test function twice with the same git repo and fake GitHub state
     3. Resets git working directory between runs but preserves GitHub state
     4. Helps ensure tests work correctly with existing PRs and state
+
+    Tests that never change the fake GitHub state (analyze, pretend mode) can
+    pass read_only=True: their second pass would see exactly the state the
+    first one did, so they run once.
     
     Usage:
         @run_twice_in_mock_mode
         def test_something(test_repo_ctx):
             # test code here
+
+        @run_twice_in_mock_mode(read_only=True)
+        def test_something_read_only(test_repo_ctx):
+            # test code here
     """
+    if func is None:
+        return functools.partial(_run_twice, read_only=read_only)
+    return _run_twice(func, read_only=read_only)
+
+
+def _run_twice(func: F, read_only: bool) -> F:
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         # Check if we're in mock mode
@@ -34,6 +53,11 @@ def run_twice_in_mock_mode(func: F) -> F:
             # In real GitHub mode, just run once
             logger.info(f"Running {func.__name__} once (real GitHub mode)")
             return func(*args, **kwargs)
+
+        if read_only:
+            # Nothing carries over between passes, so a rerun adds no coverage
+            logger.info(f"Running {func.__name__} once (read-only test)")
+            return func(*args, **kwargs)
         
         # Find the test_repo_ctx in args/kwargs
         test_repo_ctx = None
@@ -62,23 +86,18 @@ def run_twice_in_mock_mode(func: F) -> F:
             os.chdir(test_repo_ctx.repo_dir)
             
             # Save current branch name (usually test_local)
-            current_branch = run_cmd("git rev-parse --abbrev-ref HEAD").strip()
+            current_branch = test_repo_ctx.git_cmd.must_git("rev-parse --abbrev-ref HEAD").strip()
             
-            # Clean up any uncommitted changes
-            run_cmd("git reset --hard HEAD")
-            run_cmd("git clean -fd")
-            
-            # Go back to main branch
-            run_cmd("git checkout main")
+            # Clean up untracked files; checkout -f below discards other changes
+            reset_cmds = ["git clean -fd"]
             
             # Update main to match origin/main (including merged PRs from first run)
-            run_cmd("git reset --hard origin/main")
-            
-            # Delete the test branch
-            run_cmd(f"git branch -D {current_branch} || true")
+            if current_branch != "main":
+                reset_cmds.append("git branch -f main origin/main")
             
-            # Create a fresh test branch
-            run_cmd(f"git checkout -b {current_branch}")
+            # Recreate the test branch fresh from the updated main
+            reset_cmds.append(f"git checkout -f --no-track -B {current_branch} origin/main")
+            run_cmds(*reset_cmds)
             
             logger.info(f"=== Running {func.__name__} SECOND time (mock mode with existing GitHub state) ===")
             
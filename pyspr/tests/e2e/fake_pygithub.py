@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-import yaml
+import json
+import hashlib
+import re
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Any, Tuple, Optional, cast
 import subprocess
 from pathlib import Path
@@ -16,6 +18,10 @@ from pyspr.github import PyGithubProtocol, GitHubRepoProtocol, GitHubPullRequest
 
 logger = logging.getLogger(__name__)
 
+def _record(obj: Any) -> Dict[str, Any]:
+    """A dataclass's fields as a JSON-ready dict, minus the link back to FakeGithub."""
+    return {f.name: getattr(obj, f.name) for f in fields(obj) if f.name != "maybe_github_ref"}
+
 @dataclass
 class FakeNamedUser:
     """Fake implementation of the NamedUser class from PyGithub."""
@@ -525,10 +531,7 @@ class FakeRepository:
         if not self.github_ref:
             raise ValueError("Repository not linked to GitHub instance")
             
-        # Always reload state first to ensure we have the latest data
-        logger.info(f"Reloading state before getting PR #{number} from repository {self.full_name}")
-        self.github_ref.load_state()
-            
+        # FakeGithub.get_pull reloads state itself to ensure we have the latest data
         pr = self.github_ref.get_pull(number, repo_name=self.full_name)
         if pr is None:
             raise ValueError(f"PR #{number} not found in repository {self.full_name}")
@@ -734,8 +737,10 @@ class FakeRequester:
         # Always reload state first
         self.github_ref.load_state()
         
-        _query = input.get("query", "")
-        _variables = input.get("variables", {})
+        query = str(input.get("query", ""))
+        variables = cast(Dict[str, object], input.get("variables", {}))
+        if "pullRequest(number:" in query:
+            return self._handle_pull_request_lookup(query, variables)
         
         # Default empty response structure
         response: Dict[str, object] = {
@@ -772,8 +777,13 @@ class FakeRequester:
                     "body": pr.body,
                     "baseRefName": pr.base.ref,
                     "headRefName": pr.head.ref,
+                    "headRefOid": pr.commit.commit_hash,
                     "mergeable": "MERGEABLE",
                     "reviewDecision": None,
+                    "reviewRequests": {
+                        "nodes": [{"requestedReviewer": {"login": login}}
+                                  for login in pr.data_record.reviewers]
+                    },
                     "repository": {
                         "id": f"repo_{pr.data_record.repository_name}"
                     },
@@ -805,6 +815,23 @@ class FakeRequester:
         # Return tuple of (headers, data)
         return ({}, response)
 
+    def _handle_pull_request_lookup(self, query: str, variables: Dict[str, object]) -> Tuple[Dict[str, object], Dict[str, object]]:
+        """Handle repository { pr<N>: pullRequest(number: N) {...} } lookups by number."""
+        full_name = f"{variables.get('owner')}/{variables.get('name')}"
+        nodes: Dict[str, object] = {}
+        for alias, number in re.findall(r"(\w+): pullRequest\(number: (\d+)\)", query):
+            pr = self.github_ref.pull_requests.get(f"{full_name}:{number}")
+            # Like GitHub, PRs that don't exist come back as null
+            nodes[alias] = None if pr is None else {
+                "number": pr.number,
+                "reviewRequests": {
+                    "nodes": [{"requestedReviewer": {"login": login}}
+                              for login in pr.data_record.reviewers]
+                },
+            }
+        logger.info(f"GraphQL looked up {len(nodes)} PRs by number in {full_name}")
+        return ({}, {"data": {"repository": nodes}})
+
 @dataclass
 class FakeGithub(PyGithubProtocol):
     """Fake implementation of the Github class from PyGithub."""
@@ -815,6 +842,8 @@ class FakeGithub(PyGithubProtocol):
     _user: FakeNamedUser
     data_dir: Path
     state_file: Path
+    # Digest of the state file as last loaded or saved by this instance
+    _state_digest: Optional[bytes] = field(default=None, repr=False, compare=False)
     
     def initialize(self, load_state: bool = True):
         """Initialize the instance with proper setup.
@@ -838,7 +867,7 @@ class FakeGithub(PyGithubProtocol):
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         if not self.state_file:
-            self.state_file = self.data_dir / "fake_github_state.yaml"
+            self.state_file = self.data_dir / "fake_github_state.json"
         else:
             # Ensure state_file is a Path object
             self.state_file = Path(self.state_file)
@@ -879,22 +908,24 @@ class FakeGithub(PyGithubProtocol):
             return
         
         try:
-            # Configure YAML to handle object references properly
-            # Type ignore for YAML loader configuration - this is a known pattern
-            yaml.Loader.ignore_aliases = lambda *args: False  # type: ignore
+            raw = self.state_file.read_bytes()
+            digest = hashlib.sha1(raw).digest()
+            if digest == self._state_digest:
+                # Nobody saved since we last loaded or saved; skip the parse
+                logger.debug(f"State file {self.state_file} unchanged, not reloading")
+                return
             
-            with open(self.state_file, "r") as f:
-                # Use the Loader that preserves object types and references
-                data = yaml.load(f, Loader=yaml.Loader)
+            data = json.loads(raw) if raw.strip() else None
+            self._state_digest = digest
             
             if data:
-                if isinstance(data, FakeGithub):
-                    # New format - direct object
-                    self.users = data.users
-                    self.repositories = data.repositories
-                    self.pull_requests = data.pull_requests
-                    self._user = data._user
-                    # Don't copy state_file and data_dir
+                # The state is stored flat; objects are linked back to this
+                # instance below rather than through references in the file
+                self.users = {login: FakeNamedUser(**user) for login, user in data["users"].items()}
+                self.repositories = {name: FakeRepository(**repo) for name, repo in data["repositories"].items()}
+                self.pull_requests = {key: FakePullRequest(data_record=FakePullRequestData(**pr))
+                                      for key, pr in data["pull_requests"].items()}
+                self._user = FakeNamedUser(**data["user"])
                 
                 # Set proper github_ref for all objects after loading
                 self._link_objects()
@@ -940,15 +971,16 @@ class FakeGithub(PyGithubProtocol):
         # Replace the pull_requests dict with the cleaned version
         self.pull_requests = clean_pull_requests
         
-        # Configure YAML to properly handle object references
-        # Type ignore for YAML dumper configuration - this is a known pattern
-        yaml.Dumper.ignore_aliases = lambda *args: False  # type: ignore
-        
         try:
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, "w") as f:
-                # Use yaml.Dumper to preserve object types and references
-                yaml.dump(self, f, Dumper=yaml.Dumper, default_flow_style=False)
+            raw = json.dumps({
+                "users": {login: _record(user) for login, user in self.users.items()},
+                "repositories": {name: _record(repo) for name, repo in self.repositories.items()},
+                "pull_requests": {key: _record(pr.data_record) for key, pr in self.pull_requests.items()},
+                "user": _record(self._user),
+            }).encode()
+            self.state_file.write_bytes(raw)
+            self._state_digest = hashlib.sha1(raw).digest()
             logger.info(f"Saved state to {self.state_file}")
         except Exception as e:
             logger.error(f"Error saving state: {e}")
@@ -1053,12 +1085,12 @@ def create_fake_github(token: Optional[str] = None,
     Args:
         token: Optional GitHub token (not used, but included for API compatibility)
         data_dir: Directory to store state files in, defaults to $CWD/.git/fake_github
-        state_file: Path to the state file to use, defaults to data_dir/fake_github_state.yaml
+        state_file: Path to the state file to use, defaults to data_dir/fake_github_state.json
     """
     if not data_dir:
         data_dir = Path(os.getcwd()) / ".git" / "fake_github"
     if not state_file:
-        state_file = data_dir / "fake_github_state.yaml"
+        state_file = data_dir / "fake_github_state.json"
     
     # Create initial empty state
     github = FakeGithub(
@@ -4,16 +4,77 @@ import os
 import tempfile
 import uuid
 import logging
+import shutil
 import subprocess
-from typing import Generator, Dict
+from typing import Generator, Dict, Tuple
+
+import yaml
 
 from pyspr.config import Config
-from pyspr.git import RealGit
-from pyspr.tests.e2e.test_helpers import RepoContext, run_cmd
+from pyspr.git import CachingGit
+from pyspr.tests.e2e.test_helpers import RepoContext, link_or_copy, run_cmd, run_cmds, xdist_worker_id
 from pyspr.tests.e2e.mock_setup import create_github_client
 
 logger = logging.getLogger(__name__)
 
+# Pristine (remote.git, working repo) pairs keyed by (owner, name), built once
+# per test session and copied into each test's tmpdir
+_repo_templates: Dict[Tuple[str, str], str] = {}
+
+def get_repo_template(owner: str, name: str) -> str:
+    """Get a template dir holding remote.git and an initialized working repo.
+    
+    The template has README.md and .spr.yaml committed and pushed to main.
+    It is built on first use and reused for the rest of the session.
+    """
+    key = (owner, name)
+    if key in _repo_templates:
+        return _repo_templates[key]
+    
+    tmpdir = tempfile.mkdtemp(prefix="pyspr_template_")
+    logger.info(f"Building repo template for {owner}/{name} in {tmpdir}")
+    remote_dir = os.path.join(tmpdir, "remote.git")
+    repo_dir = os.path.join(tmpdir, name)
+    os.makedirs(remote_dir)
+    os.mkdir(repo_dir)
+    
+    run_cmd(f"git init --bare {remote_dir}")
+    run_cmd("git init", cwd=repo_dir)
+    run_cmd(f"git remote add origin file://{remote_dir}", cwd=repo_dir)
+    run_cmd("git config user.name 'Test User'", cwd=repo_dir)
+    run_cmd("git config user.email 'test@example.com'", cwd=repo_dir)
+    # Disable GPG signing for tests
+    run_cmd("git config commit.gpgsign false", cwd=repo_dir)
+    
+    # Create initial file
+    with open(os.path.join(repo_dir, "README.md"), "w") as f:
+        f.write(f"# {name} test repository\n\nUsed for automated testing.")
+    run_cmd("git add README.md", cwd=repo_dir)
+    run_cmd("git commit -m 'Initial commit'", cwd=repo_dir)
+    run_cmd("git branch -M main", cwd=repo_dir)
+    run_cmd("git push -u origin main", cwd=repo_dir)
+    
+    # Create a .spr.yaml file in the repo to ensure config is read by subprocesses
+    config_dict: Dict[str, Dict[str, object]] = {
+        'repo': {
+            'github_remote': 'origin',
+            'github_branch': 'main',
+            'github_branch_target': 'main',
+            'github_repo_owner': owner,
+            'github_repo_name': name,
+            'use_mock_github': True,
+        },
+        'user': {}
+    }
+    with open(os.path.join(repo_dir, '.spr.yaml'), 'w') as f:
+        yaml.dump(config_dict, f)
+    run_cmd("git add .spr.yaml", cwd=repo_dir)
+    run_cmd("git commit -m 'Add .spr.yaml for testing'", cwd=repo_dir)
+    run_cmd("git push origin main", cwd=repo_dir)
+    
+    _repo_templates[key] = tmpdir
+    return tmpdir
+
 def create_mock_repo_context(owner: str, name: str, test_name: str) -> Generator[RepoContext, None, None]:
     """Create a local repository context with a file remote for testing.
     
@@ -28,9 +89,10 @@ def create_mock_repo_context(owner: str, name: str, test_name: str) -> Generator
     # Always use temp branch for isolation
     orig_dir = os.getcwd()
     test_type = test_name.replace('test_', '')
-    unique_tag = f"test-{test_type}-{uuid.uuid4().hex[:8]}"
+    worker = xdist_worker_id()
+    unique_tag = f"test-{test_type}-{worker}-{uuid.uuid4().hex[:8]}"
     
-    test_branch = f"test-spr-{uuid.uuid4().hex[:7]}" 
+    test_branch = f"test-spr-{worker}-{uuid.uuid4().hex[:7]}"
     logger.info(f"Using test branch {test_branch} for local test repo")
     logger.info(f"Starting in directory: {orig_dir}")
     
@@ -52,7 +114,7 @@ def create_mock_repo_context(owner: str, name: str, test_name: str) -> Generator
             tmpdir = tempfile.mkdtemp(prefix="pyspr_test_")
             logger.info(f"Using temporary directory: {tmpdir}")
         
-        # Create a bare repository that will serve as our remote
+        # The bare repository that serves as our remote, and the working repo
         remote_dir = os.path.join(tmpdir, "remote.git")
         repo_dir = os.path.join(tmpdir, name)
         
@@ -63,98 +125,45 @@ def create_mock_repo_context(owner: str, name: str, test_name: str) -> Generator
             logger.info(f"Reusing existing repository at {repo_dir}")
             os.chdir(repo_dir)
             # Reset to main branch for a clean start
-            run_cmd("git checkout main")
-            run_cmd("git pull origin main")
+            run_cmds("git fetch origin main", "git checkout -B main origin/main")
         else:
-            # First run or non-persistent mode - create fresh repos
-            if not os.path.exists(remote_dir):
-                os.makedirs(remote_dir)
-                run_cmd(f"git init --bare {remote_dir}")
-            
-            if not os.path.exists(repo_dir):
-                os.mkdir(repo_dir)
+            # First run or non-persistent mode - copy the session template
+            # instead of running git init/commit/push from scratch
+            template_dir = get_repo_template(owner, name)
+            shutil.copytree(template_dir, tmpdir, symlinks=True,
+                            copy_function=link_or_copy, dirs_exist_ok=True)
             os.chdir(repo_dir)
             logger.info(f"Changed to repository directory: {repo_dir}")
             
-            # Initialize git and set the remote
-            run_cmd("git init")
-            file_remote_url = f"file://{remote_dir}"
-            run_cmd(f"git remote add origin {file_remote_url}")
-        
-        if not is_second_run:
-            # Add an initial commit and push to establish main branch
-            run_cmd("git config user.name 'Test User'")
-            run_cmd("git config user.email 'test@example.com'")
-            # Disable GPG signing for tests
-            run_cmd("git config commit.gpgsign false")
-            
-            # Create initial file
-            with open("README.md", "w") as f:
-                f.write(f"# {name} test repository\n\nUsed for automated testing.")
-            
-            # Commit and push
-            run_cmd("git add README.md")
-            run_cmd("git commit -m 'Initial commit'")
-            
-            # Create and checkout main branch
-            run_cmd("git branch -M main")
-            run_cmd("git push -u origin main")
-        
-        # Always need file_remote_url
-        file_remote_url = f"file://{remote_dir}"
-        
-        if not is_second_run:
-            # Create a .spr.yaml file in the repo to ensure config is read by subprocesses
-            config_dict: Dict[str, Dict[str, object]] = {
-                'repo': {
-                    'github_remote': 'origin',
-                    'github_branch': 'main',
-                    'github_branch_target': 'main',
-                    'github_repo_owner': owner,
-                    'github_repo_name': name,
-                    'use_mock_github': True,
-                    'mock_remote_url': file_remote_url
-                },
-                'user': {}
-            }
-            
-            # Write .spr.yaml file
-            import yaml
-            with open('.spr.yaml', 'w') as f:
-                yaml.dump(config_dict, f)
-            
-            # Add .spr.yaml to git and push to main
-            run_cmd("git add .spr.yaml")
-            run_cmd("git commit -m 'Add .spr.yaml for testing'")
-            run_cmd("git push origin main")
-        else:
-            # Load existing config
-            import yaml
-            with open('.spr.yaml', 'r') as f:
-                config_dict = yaml.safe_load(f)
+            # Point origin at this test's copy of the remote by patching the
+            # copied config directly rather than running git remote set-url
+            git_config = os.path.join(repo_dir, ".git", "config")
+            with open(git_config) as f:
+                config_text = f.read()
+            template_remote = os.path.join(template_dir, "remote.git")
+            with open(git_config, "w") as f:
+                f.write(config_text.replace(f"file://{template_remote}", f"file://{remote_dir}"))
+        
+        with open('.spr.yaml', 'r') as f:
+            config_dict = yaml.safe_load(f)
         
         if is_second_run:
             # For second run, create a new test branch with different name
-            test_branch = f"test-spr-run2-{uuid.uuid4().hex[:7]}"
+            test_branch = f"test-spr-run2-{worker}-{uuid.uuid4().hex[:7]}"
             logger.info(f"Second run: using new test branch {test_branch}")
         
-        # Create test branch from updated main
-        run_cmd(f"git checkout -b {test_branch}")
-        run_cmd(f"git push -u origin {test_branch}")
-        
-        # Create or reset local branch for tests
-        if is_second_run:
-            # Delete old test_local if it exists
-            run_cmd("git branch -D test_local || true")
-        run_cmd("git checkout -b test_local")
+        # Create test branch from updated main, then create (or on a second
+        # run, reset) the local branch for tests
+        run_cmds(f"git branch {test_branch}", f"git push -u origin {test_branch}",
+                 "git checkout -B test_local")
         
         repo_dir = os.path.abspath(os.getcwd())
         
-        # Create config - this will be used by RealGit and GitHubClient
+        # Create config - this will be used by CachingGit and GitHubClient
         config = Config(config_dict)
         
         # Create git and GitHub clients
-        git_cmd = RealGit(config)
+        git_cmd = CachingGit(config)
         
         # Create GitHub client using our mock_setup helper
         # Force mock GitHub for tests to ensure consistency
@@ -173,11 +182,14 @@ def create_mock_repo_context(owner: str, name: str, test_name: str) -> Generator
         
         yield ctx
         
-        # Clean up branches
+        # A copied template repo is thrown away with its tmpdir, so branches
+        # only need cleaning up when the repo is kept for the next run
+        if not preserve_state:
+            return
         try:
             run_cmd("git checkout main")
-            run_cmd(f"git branch -D {test_branch} || true")
-            run_cmd(f"git push origin --delete {test_branch} || true")
+            run_cmd(f"git branch -D {test_branch}", check=False)
+            run_cmd(f"git push origin --delete {test_branch}", check=False)
         except subprocess.CalledProcessError as e:
             logger.warning(f"Error during cleanup: {e}")
         
@@ -2,10 +2,10 @@
 
 import logging
 import sys
-from typing import Dict, List, Tuple
+from typing import Dict, List, Mapping, Sequence, Tuple
 
 from pyspr.tests.e2e.decorators import run_twice_in_mock_mode
-from pyspr.tests.e2e.test_helpers import RepoContext, run_cmd
+from pyspr.tests.e2e.test_helpers import RepoContext, fast_import_commits, run_cmd
 
 # Configure logging
 logging.basicConfig(
@@ -25,7 +25,7 @@ log.propagate = True  # Allow logs to propagate to pytest
 
 
 def create_commits_from_dag(
-    dependencies: Dict[str, List[str]], commits_order: List[str]
+    dependencies: Mapping[str, Sequence[str]], commits_order: Sequence[str]
 ) -> None:
     """Create commits based on dependency DAG.
 
@@ -39,17 +39,22 @@ def create_commits_from_dag(
     """
     # Track which file each commit primarily owns/creates
     commit_files: Dict[str, str] = {}
+    # Current content of every file the DAG has touched
+    contents: Dict[str, str] = {}
+    # (message, {path: new content}) per commit, written in one fast-import stream
+    commits: List[Tuple[str, Dict[str, str]]] = []
 
     # Create commits in topological order
     for commit_name in commits_order:
         deps = dependencies.get(commit_name, [])
+        changed: Dict[str, str] = {}
 
         if not deps:
             # Independent commit - creates its own file
             filename = f"file_{commit_name}.txt"
             commit_files[commit_name] = filename
-            with open(filename, "w") as f:
-                f.write(f"{commit_name}'s content\n")
+            contents[filename] = f"{commit_name}'s content\n"
+            changed[filename] = contents[filename]
         else:
             # Dependent commit - modifies files from dependencies
             files_modified: List[str] = []
@@ -61,19 +66,20 @@ def create_commits_from_dag(
                     files_modified.append(dep_file)
 
                     # Append our modification
-                    with open(dep_file, "a") as f:
-                        f.write(f"{commit_name}'s addition to {dep}'s file\n")
+                    contents[dep_file] += f"{commit_name}'s addition to {dep}'s file\n"
+                    changed[dep_file] = contents[dep_file]
 
             # If this commit is depended on by others, track its primary file
             # (the first dependency's file it modifies)
             if files_modified and commit_name not in commit_files:
                 commit_files[commit_name] = files_modified[0]
 
-        run_cmd("git add .")
-        run_cmd(f"git commit -m '{commit_name}'")
+        commits.append((commit_name, changed))
 
+    fast_import_commits(commits)
 
-@run_twice_in_mock_mode
+
+@run_twice_in_mock_mode(read_only=True)
 def test_analyze_complex_dependencies(test_repo_ctx: RepoContext) -> None:
     """Test analyze command with complex dependency structure.
 
@@ -1,35 +1,61 @@
 """End-to-end test for amending commits in stack, PR stack isolation, WIP and reviewer behavior."""
 # pyright: reportUnusedVariable=none
 
+import json
 import os
+import re
+import shlex
 import sys
+import heapq
 import uuid
 import subprocess
 import time
-import datetime
 import logging
-from typing import Dict, Generator, List, Optional, Set, Tuple, Union, Protocol, runtime_checkable
+from pathlib import Path
+from typing import Dict, Generator, List, Optional, Set, Tuple, Union
 import pytest
+import yaml
 
-from pyspr.tests.e2e.test_helpers import RepoContext, run_cmd
+from pyspr.tests.e2e.test_helpers import RepoContext, commit_tag, fast_import_commits, get_test_prs, make_tagged_commit, prepend_line, retry, run_cmd, run_cmds, run_pyspr, wait_for, xdist_worker_id
 from pyspr.tests.e2e.decorators import run_twice_in_mock_mode
 from pyspr.tests.e2e.test_analyze import create_commits_from_dag
 from pyspr.config import Config
-from pyspr.git import RealGit
+from pyspr.git import CachingGit
 from pyspr.github import GitHubClient, PullRequest, GitHubInfo
-from pyspr.typing import Commit
 from pyspr.tests.e2e.fixtures import create_test_repo
 
 CURRENT_USER = "yang"  # Since we're using yang's token for tests
 
-
-@runtime_checkable
-class UserWithLogin(Protocol):
-    """Protocol for objects with login attribute."""
-    @property
-    def login(self) -> str:
-        """User login name."""
-        ...
+_WIP_RE = re.compile(r"^WIP\b")
+_COMMIT_ID_RE = re.compile(r"commit-id:([a-f0-9]{8})")
+# Dependency DAG shared by the breakup tests (same as test_analyze)
+_BREAKUP_DAG: Dict[str, Tuple[str, ...]] = {
+    "A": (),  # Independent
+    "B": ("A",),  # Depends on A
+    "C": ("A",),  # Depends on A
+    "D": ("A", "C"),  # Depends on both A and C
+    "E": ("C",),  # Depends on C
+    "F": (),  # Independent
+    "G": ("E", "F"),  # Depends on both E and F - fails plain breakup, orphan with --stacks
+    "H": (),  # Independent
+    "I": ("H",),  # Depends on H
+    "J": ("H", "I"),  # Depends on both H and I
+    "K": (),  # Independent
+    "L": ("K",),  # Depends on K
+    "M": (),  # Independent
+}
+# Topological order the DAG's commits are created in
+_BREAKUP_DAG_ORDER = ("A", "F", "H", "K", "M", "B", "C", "I", "D", "E", "L", "J", "G")
+
+
+def _dag_commit_name(title: str) -> Optional[str]:
+    """Return the breakup DAG commit a PR title is for, if any.
+
+    create_commits_from_dag uses the commit's name as its message, so the
+    name is the title's first word and a dict lookup replaces any scanning.
+    """
+    words = title.split(maxsplit=1)
+    return words[0] if words and words[0] in _BREAKUP_DAG else None
 
 
 # Configure logging
@@ -53,19 +79,19 @@ def test_delete_insert(test_repo_ctx: RepoContext) -> None:
     ctx = test_repo_ctx
 
     # Create four test commits with unique tag in message
-    ctx.make_commit("test1.txt", "test content 1", "First commit")
-    ctx.make_commit("test2.txt", "test content 2", "Second commit")
-    ctx.make_commit("test3.txt", "test content 3", "Third commit")
-    ctx.make_commit("test4.txt", "test content 4", "Fourth commit")
+    ctx.make_commits_bulk([
+        ("test1.txt", "test content 1", "First commit"),
+        ("test2.txt", "test content 2", "Second commit"),
+        ("test3.txt", "test content 3", "Third commit"),
+        ("test4.txt", "test content 4", "Fourth commit"),
+    ])
     
     # Run pyspr update
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
     
     # Get commit hashes after update 
-    commit1_hash = ctx.git_cmd.must_git("rev-parse HEAD~3").strip()
-    commit2_hash = ctx.git_cmd.must_git("rev-parse HEAD~2").strip()
-    commit3_hash = ctx.git_cmd.must_git("rev-parse HEAD~1").strip() 
-    commit4_hash = ctx.git_cmd.must_git("rev-parse HEAD").strip()
+    commit1_hash, commit2_hash, commit3_hash, commit4_hash = ctx.git_cmd.rev_parse_many(
+        "HEAD~3", "HEAD~2", "HEAD~1", "HEAD")
 
     # Verify initial PRs were created
     prs = ctx.get_test_prs()
@@ -92,24 +118,23 @@ def test_delete_insert(test_repo_ctx: RepoContext) -> None:
     
     # Now reset and recreate commits but skip commit2 and add c3.5
     log.info("\nRecreating commits without second commit and adding c3.5...")
-    run_cmd("git reset --hard HEAD~4")  # Remove all commits
 
     # Get the original commit messages (stored for debugging)
-    c1_msg = ctx.git_cmd.must_git(f"show -s --format=%B {commit1_hash}").strip()  # noqa
-    c3_msg = ctx.git_cmd.must_git(f"show -s --format=%B {commit3_hash}").strip()  # noqa
-    c4_msg = ctx.git_cmd.must_git(f"show -s --format=%B {commit4_hash}").strip()  # noqa
+    msgs = ctx.git_cmd.batch_show_messages([commit1_hash, commit3_hash, commit4_hash])
+    c1_msg = msgs[commit1_hash].strip()  # noqa
+    c3_msg = msgs[commit3_hash].strip()  # noqa
+    c4_msg = msgs[commit4_hash].strip()  # noqa
     
-    # Recreate commits but skip commit2 and add c3.5
-    run_cmd(f"git cherry-pick {commit1_hash}")
-    run_cmd(f"git cherry-pick {commit3_hash}")
+    # Remove all commits, then recreate them but skip commit2 and add c3.5
+    run_cmds("git reset --hard HEAD~4", f"git cherry-pick {commit1_hash} {commit3_hash}")
     
     # Add new c3.5 commit
     ctx.make_commit("test3_5.txt", "test content 3.5", "Commit three point five")
 
-    run_cmd(f"git cherry-pick {commit4_hash}")
+    run_cmd(["git", "cherry-pick", commit4_hash])
 
     # Run pyspr update again
-    run_cmd("pyspr update -v")
+    run_pyspr(["update", "-v"])
     
     # Get PRs after removing commit2 and adding c3.5
     prs = ctx.get_test_prs()
@@ -125,11 +150,13 @@ def test_delete_insert(test_repo_ctx: RepoContext) -> None:
     assert pr4_num in current_pr_nums, f"PR4 #{pr4_num} should still exist"
 
     # Get PRs by number
-    pr1_after = next((pr for pr in prs if pr.number == pr1_num), None)
-    pr3_after = next((pr for pr in prs if pr.number == pr3_num), None)
-    pr4_after = next((pr for pr in prs if pr.number == pr4_num), None)
+    by_number: Dict[int, PullRequest] = {pr.number: pr for pr in prs}
+    pr1_after = by_number.get(pr1_num)
+    pr3_after = by_number.get(pr3_num)
+    pr4_after = by_number.get(pr4_num)
     # Find the new PR for c3.5
-    pr35 = next((pr for pr in prs if pr.number not in [pr1_num, pr2_num, pr3_num, pr4_num]), None)
+    new_prs = [pr for pr in prs if pr.number not in (pr1_num, pr2_num, pr3_num, pr4_num)]
+    pr35 = new_prs[0] if new_prs else None
     
     assert pr1_after is not None, f"PR1 #{pr1_num} should exist"
     assert pr3_after is not None, f"PR3 #{pr3_num} should exist"
@@ -143,12 +170,9 @@ def test_delete_insert(test_repo_ctx: RepoContext) -> None:
     assert pr4_after.base_ref == f"pyspr/{pr35.commit.commit_id}", "Fourth PR should target new PR's branch"
     
     # Verify PR order and proper chain connectivity
-    current_shas: Dict[str, str] = {
-        "first": ctx.git_cmd.must_git("rev-parse HEAD~3").strip(),
-        "third": ctx.git_cmd.must_git("rev-parse HEAD~2").strip(),
-        "three_five": ctx.git_cmd.must_git("rev-parse HEAD~1").strip(),
-        "fourth": ctx.git_cmd.must_git("rev-parse HEAD").strip()
-    }
+    current_shas: Dict[str, str] = dict(zip(
+        ("first", "third", "three_five", "fourth"),
+        ctx.git_cmd.rev_parse_many("HEAD~3", "HEAD~2", "HEAD~1", "HEAD")))
     
     # Verify PR hashes match new local commit hashes after update
     assert pr1_after.commit.commit_hash == current_shas["first"], f"PR1 hash {pr1_after.commit.commit_hash} should match new local commit hash {current_shas['first']}"
@@ -170,28 +194,27 @@ def test_wip_behavior(test_repo_ctx: RepoContext, caplog: pytest.LogCaptureFixtu
     caplog.set_level(logging.INFO)
     ctx = test_repo_ctx
     git_cmd = ctx.git_cmd
-    github = ctx.github
     
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Creating commits...")
+    log.info("Creating commits...")
     # Create 4 commits: 2 regular, 1 WIP, 1 regular
-    ctx.make_commit("wip_test1.txt", "test content", "First regular commit")
-    ctx.make_commit("wip_test2.txt", "test content", "Second regular commit")
-    ctx.make_commit("wip_test3.txt", "test content", "WIP Third commit")
-    ctx.make_commit("wip_test4.txt", "test content", "Fourth regular commit")  # Not used but kept for completeness
+    ctx.make_commits_bulk([
+        ("wip_test1.txt", "test content", "First regular commit"),
+        ("wip_test2.txt", "test content", "Second regular commit"),
+        ("wip_test3.txt", "test content", "WIP Third commit"),
+        ("wip_test4.txt", "test content", "Fourth regular commit"),  # Not used but kept for completeness
+    ])
     
     # Run update to create PRs
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Running pyspr update...")
-    run_cmd("pyspr update")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} pyspr update complete")
+    log.info("Running pyspr update...")
+    run_pyspr(["update"])
+    log.info("pyspr update complete")
     
     # Get commit hashes after update
-    c1_hash = git_cmd.must_git("rev-parse HEAD~3").strip()
-    c2_hash = git_cmd.must_git("rev-parse HEAD~2").strip()
-    c3_hash = git_cmd.must_git("rev-parse HEAD~1").strip()
+    c1_hash, c2_hash, c3_hash = git_cmd.rev_parse_many("HEAD~3", "HEAD~2", "HEAD~1")
     
-    # Let GitHub process the PRs
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Waiting for PRs to be available in GitHub...")
-    time.sleep(5)
+    # Let GitHub process the PRs (immediate in mock mode)
+    log.info("Waiting for PRs to be available in GitHub...")
+    wait_for(lambda: len(ctx.get_test_prs()) >= 2, timeout=10, interval=0.2)
 
     # Debug: Check what branches actually exist
     log.info("Checking remote branches:")
@@ -202,42 +225,34 @@ def test_wip_behavior(test_repo_ctx: RepoContext, caplog: pytest.LogCaptureFixtu
     
     # We'll use ctx.get_test_prs() directly, with timing logs around it
     log.info("=== ABOUT TO CALL GITHUB API ===")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Starting PR filtering...")
+    log.info("Starting PR filtering...")
     gh_start = time.time()
     test_prs = ctx.get_test_prs()
     gh_end = time.time()
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} PR filtering took {gh_end - gh_start:.2f} seconds")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Found {len(test_prs)} matching PRs")
+    log.info(f"PR filtering took {gh_end - gh_start:.2f} seconds")
+    log.info(f"Found {len(test_prs)} matching PRs")
     
     # Verify only first two PRs were created
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Getting GitHub info...")
-    info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-    assert info is not None, "GitHub info should not be None"
-    
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Getting commit info for debugging:")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} C1: {c1_hash}")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} C2: {c2_hash}")
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} C3: {c3_hash}")
+    log.info("Getting commit info for debugging:")
+    log.info(f"C1: {c1_hash}")
+    log.info(f"C2: {c2_hash}")
+    log.info(f"C3: {c3_hash}")
     
     # Get our test PRs (already got them above)
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Using filtered test PRs...")
+    log.info("Using filtered test PRs...")
     
     # Print all PR commit hashes for debugging
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Test PR commit hashes:")
+    log.info("Test PR commit hashes:")
     for pr in test_prs:
-        log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} PR #{pr.number}: {pr.title} - {pr.commit.commit_hash}")
+        log.info(f"PR #{pr.number}: {pr.title} - {pr.commit.commit_hash}")
     
     # Sort PRs by number (most recent first) and take first 2 matching our titles
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Finding PRs with target titles...")
-    test_prs = sorted(test_prs, key=lambda pr: pr.number, reverse=True)
-    prs_with_titles: List[PullRequest] = []
-    for pr in test_prs:
-        if "First regular commit" in pr.title or "Second regular commit" in pr.title:
-            prs_with_titles.append(pr)
-        if len(prs_with_titles) == 2:
-            break
-    test_prs = prs_with_titles
-    log.info(f"{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]} Found {len(test_prs)} PRs with target titles")
+    log.info("Finding PRs with target titles...")
+    test_prs = heapq.nlargest(
+        2,
+        (pr for pr in test_prs if "First regular commit" in pr.title or "Second regular commit" in pr.title),
+        key=lambda pr: pr.number)
+    log.info(f"Found {len(test_prs)} PRs with target titles")
             
     log.info("\nMost recent matching PRs:")
     for pr in test_prs:
@@ -250,9 +265,10 @@ def test_wip_behavior(test_repo_ctx: RepoContext, caplog: pytest.LogCaptureFixtu
     assert len(prs) == 2, "Should have exactly 2 PRs"
     
     # Get commit messages to verify WIP detection worked correctly
-    c1_msg = git_cmd.must_git(f"show -s --format=%B {c1_hash}").strip()
-    c2_msg = git_cmd.must_git(f"show -s --format=%B {c2_hash}").strip()
-    c3_msg = git_cmd.must_git(f"show -s --format=%B {c3_hash}").strip() 
+    msgs = git_cmd.batch_show_messages([c1_hash, c2_hash, c3_hash])
+    c1_msg = msgs[c1_hash].strip()
+    c2_msg = msgs[c2_hash].strip()
+    c3_msg = msgs[c3_hash].strip()
     
     log.info("\nVerifying commit messages:")
     log.info(f"C1: {c1_msg}")
@@ -263,9 +279,9 @@ def test_wip_behavior(test_repo_ctx: RepoContext, caplog: pytest.LogCaptureFixtu
     assert c1_msg is not None, "First commit message should not be None"
     assert c2_msg is not None, "Second commit message should not be None"
     assert c3_msg is not None, "Third commit message should not be None"
-    assert not c1_msg.startswith("WIP"), "First commit should not be WIP"
-    assert not c2_msg.startswith("WIP"), "Second commit should not be WIP"
-    assert c3_msg.startswith("WIP"), "Third commit should be WIP"
+    assert not _WIP_RE.match(c1_msg), "First commit should not be WIP"
+    assert not _WIP_RE.match(c2_msg), "Second commit should not be WIP"
+    assert _WIP_RE.match(c3_msg), "Third commit should be WIP"
     
     # Check remaining structure
     pr1, pr2 = prs
@@ -288,7 +304,6 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
       that BOTH PRs get testluser as reviewer (not just the new one)
     """
     ctx = test_repo_ctx
-    git_cmd = ctx.git_cmd
     github = ctx.github
     repo_dir = ctx.repo_dir
 
@@ -298,35 +313,10 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
 
     try:
         # Create unique tag pattern for part 2 (we use ctx.tag for part 1)
-        unique_tag2 = f"test-reviewer-testluser-{uuid.uuid4().hex[:8]}"
+        unique_tag2 = f"test-reviewer-testluser-{xdist_worker_id()}-{uuid.uuid4().hex[:8]}"
 
         # Note: We'll still use ctx.make_commit with the test tag directly for part 1.
-        # For part 2, we need to make commits with a different tag pattern.
-        # Helper to make commits for part 2
-        def make_commit_2(file: str, msg: str) -> None:
-            full_msg = f"{msg} [test-tag:{unique_tag2}]"
-            with open(os.path.join(repo_dir, file), "w") as f:
-                f.write(f"{file}\n{msg}\n")
-            run_cmd(f"git add {file}")
-            run_cmd(f'git commit -m "{full_msg}"')
-
-        # For part 2 we need custom PR filtering by tag
-        def get_test_prs_by_tag(tag: str) -> List[PullRequest]:
-            result: List[PullRequest] = []
-            info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-            if info is None:
-                return []
-            for pr in info.pull_requests:
-                if pr.from_branch and pr.from_branch.startswith('pyspr/'):
-                    try:
-                        # Look for our unique tag in the commit message
-                        assert pr.commit is not None
-                        commit_msg: str = git_cmd.must_git(f"show -s --format=%B {pr.commit.commit_hash}")
-                        if f"test-tag:{tag}" in commit_msg:
-                            result.append(pr)
-                    except Exception:  # Skip failures since we're just filtering
-                        pass
-            return result
+        # For part 2, we make commits with a different tag pattern via make_tagged_commit.
 
         # Part 1: Test self-review case (yang token)
         log.info("\n=== Part 1: Testing self-review handling ===")
@@ -335,32 +325,18 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
         ctx.make_commit("r_test1.txt", "test content", "First commit")
 
         # Create initial PR without reviewer
-        run_cmd("pyspr update")
+        run_pyspr(["update"])
 
         # Verify first PR exists with no reviewer
-        github_info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-        assert github_info is not None, "GitHub info should not be None"
         our_prs = ctx.get_test_prs()
         assert len(our_prs) == 1, f"Should have 1 PR for our test, found {len(our_prs)}"
         pr1 = our_prs[0]
         assert github.repo is not None, "GitHub repo should be available"
-        gh_pr1 = github.repo.get_pull(pr1.number)
         
         # Debug review requests for first PR
         log.info("\nDEBUG: First PR review requests")
-        try:
-            requested_users, requested_teams = gh_pr1.get_review_requests()
-            # Extract login names - in tests, we know these are user objects
-            requested_logins: List[str] = []
-            for u in requested_users:
-                # Use protocol check to ensure type safety
-                if isinstance(u, UserWithLogin):
-                    requested_logins.append(u.login.lower())
-            log.info(f"Requested Users: {requested_logins}")
-            log.info(f"Requested Teams: {list(requested_teams)}")
-        except Exception as e:
-            log.info(f"Error getting review data: {e}")
-            requested_logins = []
+        requested_logins = github.get_review_requests_for_prs([pr1.number])[pr1.number]
+        log.info(f"Requested Users: {requested_logins}")
         
         assert CURRENT_USER.lower() not in requested_logins, f"First PR correctly has no {CURRENT_USER} reviewer (can't review own PR)"
         log.info(f"Created PR #{pr1.number} with no {CURRENT_USER} reviewer")
@@ -368,43 +344,26 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
         # Create second commit and try self-review
         log.info("\nCreating second commit with self-reviewer...")
         ctx.make_commit("r_test2.txt", "test content", "Second commit")
-        run_cmd("pyspr update -r yang")
+        run_pyspr(["update", "-r", "yang"])
 
         # Verify no self-review was added
-        info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-        assert info is not None, "GitHub info should not be None"
         our_prs = ctx.get_test_prs()
         assert len(our_prs) == 2, f"Should have 2 PRs for our test, found {len(our_prs)}"
         prs_by_num: Dict[int, PullRequest] = {pr.number: pr for pr in our_prs}
         assert pr1.number in prs_by_num, "First PR should still exist"
         
+        # Fetch review requests for both PRs at once
+        pr2 = [pr for pr in our_prs if pr.number != pr1.number][0]
+        reviewers = github.get_review_requests_for_prs([pr1.number, pr2.number])
+        
         # Verify no reviewer on first PR
-        gh_pr1 = github.repo.get_pull(pr1.number)
-        try:
-            requested_users, _ = gh_pr1.get_review_requests()
-            requested_logins1: List[str] = []
-            for u in requested_users:
-                if isinstance(u, UserWithLogin):
-                    requested_logins1.append(u.login.lower())
-            log.info(f"First PR requested users: {requested_logins1}")
-        except Exception as e:
-            log.info(f"Error getting review data: {e}")
-            requested_logins1 = []
+        requested_logins1 = reviewers[pr1.number]
+        log.info(f"First PR requested users: {requested_logins1}")
         assert CURRENT_USER.lower() not in requested_logins1, f"First PR correctly has no {CURRENT_USER} reviewer"
         
         # Verify no reviewer on second PR (self-review blocked)
-        pr2 = [pr for pr in our_prs if pr.number != pr1.number][0]
-        gh_pr2 = github.repo.get_pull(pr2.number)
-        try:
-            requested_users, _ = gh_pr2.get_review_requests()
-            requested_logins2: List[str] = []
-            for u in requested_users:
-                if isinstance(u, UserWithLogin):
-                    requested_logins2.append(u.login.lower())
-            log.info(f"Second PR requested users: {requested_logins2}")
-        except Exception as e:
-            log.info(f"Error getting review data: {e}")
-            requested_logins2 = []
+        requested_logins2 = reviewers[pr2.number]
+        log.info(f"Second PR requested users: {requested_logins2}")
         assert CURRENT_USER.lower() not in requested_logins2, f"Second PR correctly has no {CURRENT_USER} reviewer (self-review blocked)"
         
         log.info("Successfully verified self-review handling")
@@ -413,41 +372,35 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
         log.info("\n=== Part 2: Testing testluser review handling ===")
         
         # Reset to main and create new branch for second test
-        run_cmd("git checkout main")
-        run_cmd(f"git checkout -b test-reviewers-2-{uuid.uuid4().hex[:7]}")
+        run_cmds("git checkout main", f"git checkout -b test-reviewers-2-{xdist_worker_id()}-{uuid.uuid4().hex[:7]}")
         
         # Create first commit and PR
         log.info("Creating first commit without reviewer...")
-        make_commit_2("test_r1.txt", "First testluser commit")
-        run_cmd("pyspr update")
+        make_tagged_commit(repo_dir, "test_r1.txt", "First testluser commit", unique_tag2)
+        run_pyspr(["update"])
 
         # Verify first PR
-        our_prs = get_test_prs_by_tag(unique_tag2)
+        our_prs = ctx.get_prs_by_tag(unique_tag2)
         assert len(our_prs) == 1, f"Should have 1 PR for testluser test, found {len(our_prs)}"
         pr1 = our_prs[0]
-        gh_pr1 = github.repo.get_pull(pr1.number)
         
         # Verify no reviewer on first PR
-        requested_users, _ = gh_pr1.get_review_requests()
-        requested_logins: List[str] = []
-        for u in requested_users:
-            if isinstance(u, UserWithLogin):
-                requested_logins.append(u.login.lower())
+        requested_logins = github.get_review_requests_for_prs([pr1.number])[pr1.number]
         assert "testluser" not in requested_logins, "First PR correctly has no testluser reviewer"
         log.info(f"Verified PR #{pr1.number} has no reviewer")
 
         # Create second commit on the same local branch (not on spr branch)
         log.info("\nCreating second commit with testluser reviewer...")
-        make_commit_2("test_r2.txt", "Second testluser commit")
+        make_tagged_commit(repo_dir, "test_r2.txt", "Second testluser commit", unique_tag2)
 
         # Add testluser as reviewer and capture output with verbose mode
         log.info("Running pyspr update -r testluser command to add reviewer")
-        update_output = run_cmd("pyspr update -r testluser -v", cwd=repo_dir)
+        update_output = run_pyspr(["update", "-r", "testluser", "-v"], cwd=repo_dir)
         log.info(f"Update output: {update_output}")
 
         # Find our PRs again
         log.info("Finding PRs after update")
-        our_prs = get_test_prs_by_tag(unique_tag2)
+        our_prs = ctx.get_prs_by_tag(unique_tag2)
         assert len(our_prs) == 2, f"Should have 2 PRs for testluser test, found {len(our_prs)}"
         
         # Get the latest PR
@@ -456,28 +409,26 @@ def test_reviewer_functionality(test_repo_ctx: RepoContext) -> None:
         log.info(f"Latest PR: #{pr2.number}")
         
         # Directly check the state file to see what's happening with reviewers
-        log.info("Checking state file for reviewers")
-        state_file = os.path.join(repo_dir, ".git", "fake_github", "fake_github_state.yaml")
-        if os.path.exists(state_file):
-            with open(state_file, "r") as f:
-                state_content = f.read()
-                log.info(f"State file exists, size: {len(state_content)} bytes")
-                log.info(f"Reviewers in state file: {'reviewers:' in state_content}")
-        else:
-            log.info("State file does not exist")
+        if log.isEnabledFor(logging.DEBUG):
+            state_file = os.path.join(repo_dir, ".git", "fake_github", "fake_github_state.json")
+            if os.path.exists(state_file):
+                with open(state_file, "rb") as f:
+                    state = json.load(f)
+                has_reviewers = any(pr["reviewers"] for pr in state["pull_requests"].values())
+                log.debug("State file size: %d bytes, reviewers present: %s",
+                          os.path.getsize(state_file), has_reviewers)
+            else:
+                log.debug("State file does not exist")
             
         # Check that BOTH PRs now have testluser as reviewer
+        reviewers = github.get_review_requests_for_prs([pr1.number, pr2.number])
         # First PR (existing) should now have reviewer added
-        gh_pr1_updated = github.repo.get_pull(pr1.number)
-        requested_users1, _ = gh_pr1_updated.get_review_requests()
-        requested_logins1 = [u.login.lower() for u in requested_users1]
+        requested_logins1 = reviewers[pr1.number]
         log.info(f"First PR requested logins after update: {requested_logins1}")
         assert "testluser" in requested_logins1, "First PR should now have testluser reviewer (added to existing PR)"
         
         # Second PR (new) should also have reviewer
-        gh_pr2 = github.repo.get_pull(pr2.number)
-        requested_users2, _ = gh_pr2.get_review_requests()
-        requested_logins2 = [u.login.lower() for u in requested_users2]
+        requested_logins2 = reviewers[pr2.number]
         log.info(f"Second PR requested logins: {requested_logins2}")
         assert "testluser" in requested_logins2, "Second PR should have testluser reviewer"
         
@@ -495,19 +446,19 @@ def test_reorder(test_repo_ctx: RepoContext) -> None:
     git_cmd = ctx.git_cmd
 
     # Create commits c1, c2, c3, c4
-    ctx.make_commit("test1.txt", "test content 1", "First commit")
-    ctx.make_commit("test2.txt", "test content 2", "Second commit")
-    ctx.make_commit("test3.txt", "test content 3", "Third commit")
-    ctx.make_commit("test4.txt", "test content 4", "Fourth commit")
+    ctx.make_commits_bulk([
+        ("test1.txt", "test content 1", "First commit"),
+        ("test2.txt", "test content 2", "Second commit"),
+        ("test3.txt", "test content 3", "Third commit"),
+        ("test4.txt", "test content 4", "Fourth commit"),
+    ])
 
     # Run pyspr update
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
 
     # Get commit hashes after update
-    commit1_hash = git_cmd.must_git("rev-parse HEAD~3").strip()
-    commit2_hash = git_cmd.must_git("rev-parse HEAD~2").strip()
-    commit3_hash = git_cmd.must_git("rev-parse HEAD~1").strip()
-    commit4_hash = git_cmd.must_git("rev-parse HEAD").strip()
+    commit1_hash, commit2_hash, commit3_hash, commit4_hash = git_cmd.rev_parse_many(
+        "HEAD~3", "HEAD~2", "HEAD~1", "HEAD")
 
     log.info("\nLooking for PRs with unique tag...")
     # Verify initial PRs were created
@@ -535,22 +486,13 @@ def test_reorder(test_repo_ctx: RepoContext) -> None:
 
     # Now reset and recreate commits but reorder c3 and c4
     log.info("\nRecreating commits with c3 and c4 reordered...")
-    run_cmd("git reset --hard HEAD~4")  # Remove all commits
-
-    # Get the original commit messages
-    c1_msg = git_cmd.must_git(f"show -s --format=%B {commit1_hash}").strip()  # noqa: F841
-    c2_msg = git_cmd.must_git(f"show -s --format=%B {commit2_hash}").strip()  # noqa: F841 
-    c3_msg = git_cmd.must_git(f"show -s --format=%B {commit3_hash}").strip()  # noqa: F841
-    c4_msg = git_cmd.must_git(f"show -s --format=%B {commit4_hash}").strip()  # noqa: F841
 
-    # Recreate commits but with c4 before c3
-    run_cmd(f"git cherry-pick {commit1_hash}")
-    run_cmd(f"git cherry-pick {commit2_hash}")
-    run_cmd(f"git cherry-pick {commit4_hash}")  # c4 now before c3
-    run_cmd(f"git cherry-pick {commit3_hash}")  # c3 now after c4
+    # Remove all commits, then recreate them with c4 before c3
+    run_cmds("git reset --hard HEAD~4",
+             f"git cherry-pick {commit1_hash} {commit2_hash} {commit4_hash} {commit3_hash}")
 
     # Run pyspr update again
-    run_cmd("pyspr update -v")
+    run_pyspr(["update", "-v"])
 
     # Get PRs after reordering
     prs = ctx.get_test_prs()
@@ -610,28 +552,14 @@ def _run_merge_test(
         count: If set, merge only this many PRs from the bottom of stack (-c flag)
     """
     # Get context values
-    owner = repo_ctx.owner
-    repo_name = repo_ctx.name  
     repo_dir = repo_ctx.repo_dir
     git_cmd = repo_ctx.git_cmd
     github = repo_ctx.github
 
-    # Add merge queue config if needed
+    # Add merge queue config if needed. The client keeps its connection to the
+    # mock GitHub instance, and git_cmd keeps its cache, since both share this config.
     if use_merge_queue:
-        config = Config({
-            'repo': {
-                'github_remote': 'origin',
-                'github_branch': 'main',
-                'github_repo_owner': owner,
-                'github_repo_name': repo_name,
-                'merge_queue': True,
-            },
-            'user': {}
-        })
-        git_cmd = RealGit(config)
-        # Don't create a new GitHub client, just update the config in the existing one
-        # to preserve the connection to the mock GitHub instance
-        github.config = config
+        github.config.repo.merge_queue = True
     
     log.info("Creating commits...")
     try:
@@ -640,6 +568,7 @@ def _run_merge_test(
         test_files: List[str] = []
         # Get the tag suffix that will be added by make_commit
         tag_suffix = repo_ctx.tag.split('-')[-1][:8]  # Use last 8 chars of tag
+        specs: List[Tuple[str, str, str]] = []
         for i in range(num_commits):
             prefix = "test_merge" if not use_merge_queue else "mq_test"
             filename = f"{prefix}{i+1}.txt"
@@ -648,15 +577,13 @@ def _run_merge_test(
             test_files.append(actual_filename)
             content = f"line 1 - {unique}"
             msg = f"Test {'merge queue' if use_merge_queue else 'multi'} commit {i+1}"
-            try:
-                log.info(f"Creating file {filename}...")
-                repo_ctx.make_commit(filename, content, msg)
-                run_cmd("git status")  # Debug: show git status after commit
-            except subprocess.CalledProcessError as e:
-                log.info(f"Git commit failed: {e}")
-                log.info("Directory contents:")
-                run_cmd("ls -la")
-                raise
+            specs.append((filename, content, msg))
+        try:
+            repo_ctx.make_commits_bulk(specs)
+        except subprocess.CalledProcessError as e:
+            log.info(f"Git commit failed: {e}")
+            log.info("Directory contents: %s", sorted(os.listdir(".")))
+            raise
     except subprocess.CalledProcessError as e:  # noqa: F841
         # Get git status for debugging
         run_cmd("git status")
@@ -664,11 +591,9 @@ def _run_merge_test(
 
     # Initial update to create PRs
     log.info("Creating initial PRs...")
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
 
     # Verify PRs created
-    github_info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-    assert github_info is not None, "GitHub info should not be None"
     prs = repo_ctx.get_test_prs()
     assert len(prs) == num_commits, f"Should have created {num_commits} PRs for our test, found {len(prs)}"
     prs = sorted(prs, key=lambda pr: pr.number)
@@ -682,16 +607,15 @@ def _run_merge_test(
             f"PR #{prs[i].number} should target PR #{prs[i-1].number}, got {prs[i].base_ref}"
 
     # Run merge for all or some PRs
-    merge_cmd = f"pyspr merge -C {repo_dir}"
+    merge_args = ["merge", "-C", repo_dir]
     if count is not None:
-        merge_cmd += f" -c {count}"
+        merge_args += ["-c", str(count)]
     log.info(f"\nMerging {'to queue' if use_merge_queue else 'all'} PRs{' (partial)' if count else ''}...")
     
     # Debug: Check if mock GitHub is being used
     log.info(f"SPR_USING_MOCK_GITHUB={os.environ.get('SPR_USING_MOCK_GITHUB', 'not set')}")
     
-    # No need for manually finding project root since run_cmd handles that
-    merge_output = run_cmd(merge_cmd)
+    merge_output = run_pyspr(merge_args)
     log.info(f"Merge command output:\n{merge_output}")
 
     # For partial merges, find the top PR number differently based on count
@@ -709,9 +633,6 @@ def _run_merge_test(
         if use_merge_queue:
             assert "added to merge queue" in merge_output, "PR should be added to merge queue"
 
-    info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-    assert info is not None, "GitHub info should not be None"
-    
     # Get the current test PRs 
     current_prs = repo_ctx.get_test_prs()
     prs_by_num: Dict[int, PullRequest] = {pr.number: pr for pr in current_prs}
@@ -740,53 +661,29 @@ def _run_merge_test(
         expected_open = len(to_remain)
         assert len(current_prs) == expected_open, f"{expected_open} test PRs should remain open, found {len(current_prs)}"
         if to_merge:
-            # Add a small delay to ensure the merge commit is available in CI
-            time.sleep(10)
-            # Get the merge commit - try multiple times to ensure it's available
-            merge_sha = ""
-            merge_msg = ""
-            for attempt in range(10):
-                # Force fetch all refs from the bare repository
-                run_cmd("git fetch origin +refs/heads/*:refs/remotes/origin/*")
-                
-                # Debug: Check what's in the bare repository directly
-                bare_repo_dir = os.path.join(os.path.dirname(repo_dir), "remote.git")
-                bare_log = run_cmd(f"git --git-dir={bare_repo_dir} log --oneline main -10")
-                log.info(f"Commits in bare repository (attempt {attempt + 1}):\n{bare_log}")
-                
-                # Get all commits on origin/main to debug
-                all_commits = git_cmd.must_git("log --oneline origin/main -10").strip()
-                log.info(f"All commits on origin/main (attempt {attempt + 1}):\n{all_commits}")
+            pr_ref = f"#{top_pr_num}"
+            
+            def find_merge_commit() -> Optional[Tuple[str, str]]:
+                # Force fetch just main from the bare repository
+                run_cmd(["git", "fetch", "--no-tags", "origin", "+main:refs/remotes/origin/main"])
+                if log.isEnabledFor(logging.DEBUG):
+                    bare_repo_dir = os.path.join(os.path.dirname(repo_dir), "remote.git")
+                    log.debug(f"Commits in bare repository:\n{run_cmd(['git', f'--git-dir={bare_repo_dir}', 'log', '--oneline', 'main', '-10'])}")
+                    log.debug(f"All commits on origin/main:\n{git_cmd.must_git('log --oneline origin/main -10').strip()}")
                 
                 # Get the latest merge commit (the HEAD of origin/main after the merge)
-                merge_sha = git_cmd.must_git("rev-parse origin/main").strip()
-                
-                # Also get the previous commit to ensure we're not looking at the wrong one
-                prev_sha = git_cmd.must_git("rev-parse origin/main~1").strip()
-                prev_msg = git_cmd.must_git(f"show -s --format=%B {prev_sha}").strip()
-                
-                merge_msg = git_cmd.must_git(f"show -s --format=%B {merge_sha}").strip()
-                # Debug log the merge commit message
-                log.info(f"Previous commit ({prev_sha}): '{prev_msg}'")
-                log.info(f"Current HEAD of origin/main ({merge_sha}): '{merge_msg}'")
-                log.info(f"Looking for PR #{top_pr_num} in merge commit message")
-                
-                # Check if we found the right commit
-                pr_ref = f"#{top_pr_num}"
-                if pr_ref in merge_msg:
-                    break
-                    
-                # Wait before retrying
-                if attempt < 9:
-                    log.info("PR reference not found, waiting before retry...")
-                    time.sleep(3)
-            # Verify merge commit contains the right PR number
-            pr_ref = f"#{top_pr_num}"
-            log.info(f"PR reference to find: '{pr_ref}', length: {len(pr_ref)}")
-            log.info(f"Is PR reference in message: {pr_ref in merge_msg}")
-            assert pr_ref in merge_msg, f"Merge commit should reference PR #{top_pr_num}"
-            # Verify merge commit contains only merged files
-            merge_files = git_cmd.must_git(f"show --name-only {merge_sha}").splitlines()
+                sha, msg = git_cmd.batch_read_commits(["origin/main"])["origin/main"]
+                return (sha, msg.strip()) if pr_ref in msg else None
+            
+            # Poll with backoff until the merge commit shows up on origin/main
+            found = retry(find_merge_commit, timeout=30)
+            assert found is not None, f"Merge commit should reference PR #{top_pr_num}"
+            merge_sha, merge_msg = found
+            log.info(f"Merge commit on origin/main ({merge_sha}): '{merge_msg}'")
+            # Verify merge commit contains only merged files. Diffing against the first
+            # parent lists exactly the files the merge brought into main, for squash and
+            # true merge commits alike, without any header or message lines.
+            merge_files = set(git_cmd.must_git(f"diff-tree --name-only -r {merge_sha}^1 {merge_sha}").splitlines())
             log.info(f"Merge files: {merge_files}")
             for i, pr in enumerate(to_merge):
                 filename = test_files[i] 
@@ -845,31 +742,20 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
     github = ctx.github
 
     log.info("\nCreating initial stack of 3 commits...")
-    run_cmd("git checkout main")
-    run_cmd("git pull")
     branch = f"test-replace-{uuid.uuid4().hex[:7]}"
-    run_cmd(f"git checkout -b {branch}")
+    run_cmds("git fetch origin main", "git checkout -B main origin/main", f"git checkout -b {branch}")
 
     test_files = ["file1.txt", "file2.txt", "file3.txt", "file2_new.txt"]  # noqa: F841
 
     # 1. Create stack with commits A -> B -> C
     ctx.make_commit("file1.txt", "line 1", "Commit A")
     ctx.make_commit("file2.txt", "line 1", "Commit B")
-    ctx.make_commit("file3.txt", "line 1", "Commit C")
-
-    # Get original commit hashes - needed for cherry-pick operations
-    orig_c1_hash = git_cmd.must_git("rev-parse HEAD~2").strip()  # noqa
-    orig_c2_hash = git_cmd.must_git("rev-parse HEAD~1").strip()  # noqa
-    orig_c3_hash = git_cmd.must_git("rev-parse HEAD").strip()
+    # Keep C's original hash for the cherry-pick below
+    orig_c3_hash = ctx.make_commit("file3.txt", "line 1", "Commit C")
 
     # Run initial update
     log.info("Creating initial PRs...")
-    run_cmd("pyspr update")
-
-    # Get hashes after update for verification
-    c1_hash = git_cmd.must_git("rev-parse HEAD~2").strip()  # noqa
-    c2_hash = git_cmd.must_git("rev-parse HEAD~1").strip()  # noqa
-    c3_hash = git_cmd.must_git("rev-parse HEAD").strip()    # noqa
+    run_pyspr(["update"])
 
     # Get initial PR info and filter to our newly created PRs
     commit_prs = ctx.get_test_prs()
@@ -877,20 +763,12 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
     assert len(commit_prs) == 3, f"Should find 3 PRs for our commits, found {len(commit_prs)}"
     
     # Verify each commit has a PR and map by commit message
-    prs_by_msg: Dict[str, PullRequest] = {}
-    for pr in commit_prs:
-        if "Commit A" in pr.title:
-            prs_by_msg["A"] = pr
-        elif "Commit B" in pr.title:
-            prs_by_msg["B"] = pr
-        elif "Commit C" in pr.title:
-            prs_by_msg["C"] = pr
-            
-    assert "A" in prs_by_msg, "No PR found for commit A"
-    assert "B" in prs_by_msg, "No PR found for commit B"
-    assert "C" in prs_by_msg, "No PR found for commit C"
-    
-    pr1, pr2, pr3 = prs_by_msg["A"], prs_by_msg["B"], prs_by_msg["C"]
+    prs_by_msg = ctx.get_prs_by_title_fragment("Commit A", "Commit B", "Commit C", prs=commit_prs)
+    pr1, pr2, pr3 = prs_by_msg["Commit A"], prs_by_msg["Commit B"], prs_by_msg["Commit C"]
+    assert pr1 is not None, "No PR found for commit A"
+    assert pr2 is not None, "No PR found for commit B"
+    assert pr3 is not None, "No PR found for commit C"
+
     log.info(f"Created PRs: #{pr1.number} (A), #{pr2.number} (B), #{pr3.number} (C)")
     pr2_num = pr2.number  # Remember B's PR number
     c2_id = pr2.commit.commit_id  # Remember B's commit ID
@@ -902,13 +780,14 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
 
     # 2. Replace commit B with new commit D
     log.info("\nReplacing commit B with new commit D...")
-    run_cmd("git reset --hard HEAD~2")  # Remove B and C
-    ctx.make_commit("file2_new.txt", "line 1", "New Commit D")
-    run_cmd(f"git cherry-pick {orig_c3_hash}")  # Add C back using original hash
+    run_cmds(
+        "git reset --hard HEAD~2",  # Remove B and C
+        ctx.commit_cmd("file2_new.txt", "line 1", "New Commit D"),
+        f"git cherry-pick {orig_c3_hash}")  # Add C back using original hash
 
     # 3. Run update
     log.info("Running update after replace...")
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
 
     # 4. Verify:
     log.info("\nVerifying PR handling after replace...")
@@ -926,11 +805,7 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
                 break
     
     # Group PRs by message type
-    prs_by_type: Dict[str, Optional[PullRequest]] = {
-        "A": next((pr for pr in relevant_prs if "Commit A" in pr.title), None),
-        "D": next((pr for pr in relevant_prs if "New Commit D" in pr.title), None),
-        "C": next((pr for pr in relevant_prs if "Commit C" in pr.title), None)
-    }
+    prs_by_type = ctx.get_prs_by_title_fragment("Commit A", "New Commit D", "Commit C", prs=relevant_prs)
     
     # - Verify B's PR state
     if pr2_num in pr_nums_to_check:
@@ -943,8 +818,8 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
         log.info(f"PR #{pr2_num} was properly closed")
     
     # - Verify new commit D has a PR
-    assert prs_by_type["D"] is not None, "Should have PR for new commit D"
-    new_pr = prs_by_type["D"]
+    new_pr = prs_by_type["New Commit D"]
+    assert new_pr is not None, "Should have PR for new commit D"
     log.info(f"Found PR #{new_pr.number} for new commit D")
     
     # Key assertions to verify we don't use positional matching:
@@ -957,9 +832,9 @@ def test_replace_commit(test_repo_ctx: RepoContext) -> None:
         assert remaining_pr.commit.commit_id != c2_id, f"PR #{remaining_pr.number} should not be matched to removed commit B"
 
     # Check final stack structure
-    pr1 = prs_by_type["A"]
-    pr_d = prs_by_type["D"]
-    pr3 = prs_by_type["C"]
+    pr1 = prs_by_type["Commit A"]
+    pr_d = prs_by_type["New Commit D"]
+    pr3 = prs_by_type["Commit C"]
     
     assert pr1 is not None, "PR1 should exist"
     assert pr_d is not None, "PR_D should exist"
@@ -978,61 +853,50 @@ def test_no_rebase_functionality(test_repo_ctx: RepoContext, caplog: pytest.LogC
     1. First update normally and verify rebase happens
     2. Then update with --no-rebase and verify rebase is skipped
     """
-    import logging
-
     # Capture logs from all loggers at INFO level
     caplog.set_level(logging.INFO, logger=None)  # Root logger 
     caplog.set_level(logging.INFO, logger="pyspr.tests")  # Test logger
     caplog.set_level(logging.INFO, logger="pyspr.tests.e2e")  # This test's logger
 
     ctx = test_repo_ctx
-
-    # Add git command logging
-    config = Config({
-        'repo': {
-            'github_remote': 'origin',
-            'github_branch': 'main',
-            'github_repo_owner': ctx.owner,
-            'github_repo_name': ctx.name,
-        },
-        'user': {
-            'log_git_commands': True
-        }
-    })  # Config constructor handles typing
-    git_cmd = RealGit(config)
-    github = GitHubClient(None, config)  # noqa: F841
+    git_cmd = ctx.git_cmd
+    config = git_cmd.config
 
     try:
         # Step 1: Create commits that need rebasing
         # Get initial commit hash
-        initial_sha = git_cmd.must_git("rev-parse HEAD").strip()  # noqa
+        initial_sha = git_cmd.short("rev-parse HEAD")  # noqa
+
+        # One suffix keeps this run's branch and file names unique
+        suffix = uuid.uuid4().hex[:7]
 
         # Create test branch from initial commit with unique name
-        test_branch_name = f"test-branch-{uuid.uuid4().hex[:7]}"
-        run_cmd(f"git checkout -b {test_branch_name}")
+        test_branch_name = f"test-branch-{suffix}"
+        run_cmd(["git", "checkout", "-b", test_branch_name])
 
         # Create test commit on our branch
-        branch_file = f"branch_change_{uuid.uuid4().hex[:7]}.txt"
-        run_cmd(f"echo 'branch change' > {branch_file}")
-        run_cmd(f"git add {branch_file}")
-        run_cmd('git commit -m "Branch change"')
-        branch_sha = git_cmd.must_git("rev-parse HEAD").strip()
+        branch_file = f"branch_change_{suffix}.txt"
+        Path(branch_file).write_text("branch change\n")
+        run_cmds(f"git add {branch_file}", 'git commit -m "Branch change"')
+        branch_sha = git_cmd.short("rev-parse HEAD")
 
         # Create feature commit on main
         # This creates a fork in history that requires rebase
-        run_cmd("git checkout main")
-        main_file = f"origin_change_{uuid.uuid4().hex[:7]}.txt"
-        run_cmd(f"echo 'origin change' > {main_file}")
-        run_cmd(f"git add {main_file}")
-        run_cmd('git commit -m "Origin change"')
-        # Simulate remote by updating origin/main refs
-        run_cmd("git update-ref refs/remotes/origin/main HEAD")
-        main_sha = git_cmd.must_git("rev-parse HEAD").strip()
-        # This is OK since we actually do want to update the main branch for the test branch to rebase on.
-        run_cmd('git push')
+        main_file = f"origin_change_{suffix}.txt"
+        # The file is new and untracked, so it carries across the checkout
+        Path(main_file).write_text("origin change\n")
+        run_cmds(
+            "git checkout main",
+            f"git add {main_file}",
+            'git commit -m "Origin change"',
+            # Simulate remote by updating origin/main refs
+            "git update-ref refs/remotes/origin/main HEAD",
+            # This is OK since we actually do want to update the main branch for the test branch to rebase on.
+            "git push")
+        main_sha = git_cmd.short("rev-parse HEAD")
 
         # Go back to test branch
-        run_cmd(f"git checkout {test_branch_name}")
+        run_cmd(["git", "checkout", test_branch_name])
         
         # Get commit count before first update
         commit_count_before = len(git_cmd.must_git("log --oneline").splitlines())  # noqa
@@ -1043,7 +907,7 @@ def test_no_rebase_functionality(test_repo_ctx: RepoContext, caplog: pytest.LogC
         
         # Actually run the update and capture output 
         try:
-            update_output = run_cmd("pyspr update")
+            update_output = run_pyspr(["update"])
         except subprocess.CalledProcessError as e:
             update_output = e.stdout + e.stderr if hasattr(e, 'stdout') else str(e)
         
@@ -1069,7 +933,7 @@ def test_no_rebase_functionality(test_repo_ctx: RepoContext, caplog: pytest.LogC
         )
         assert found_rebase, "Regular update should perform rebase"
         # Step 3: Reset to pre-rebase state 
-        run_cmd(f"git reset --hard {branch_sha}")
+        run_cmd(["git", "reset", "--hard", branch_sha])
         
         # Step 4: Test update with --no-rebase
         log.info("\nRunning update with --no-rebase logic...")
@@ -1104,7 +968,7 @@ def test_no_rebase_functionality(test_repo_ctx: RepoContext, caplog: pytest.LogC
         # 2. Checking the logs do NOT show rebase command
         
         # Check commit order in git log - should still be original commit
-        curr_sha = git_cmd.must_git("rev-parse HEAD").strip()
+        curr_sha = git_cmd.short("rev-parse HEAD")
         assert curr_sha == branch_sha, "HEAD should still be at original commit"
         
         # Check rebase was skipped
@@ -1135,7 +999,7 @@ def test_update_after_merge(test_repo_ctx: RepoContext) -> None:
     
     # Initial update to create PRs
     log.info("Creating initial PRs...")
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
     
     # Get the PRs
     prs = ctx.get_test_prs()
@@ -1148,11 +1012,11 @@ def test_update_after_merge(test_repo_ctx: RepoContext) -> None:
     
     # Merge bottom PR
     log.info("\nMerging bottom PR...")
-    run_cmd("pyspr merge -c1")
+    run_pyspr(["merge", "-c1"])
     
     # Re-run update
     log.info("\nRe-running update...")
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
     
     # Verify only one PR remains
     prs = ctx.get_test_prs()
@@ -1165,39 +1029,30 @@ def test_update_after_merge(test_repo_ctx: RepoContext) -> None:
     
     log.info(f"Verified remaining PR #{remaining_pr.number} targeting main")
 
-@run_twice_in_mock_mode
-def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
-    """Test stacking new PRs on top without changing earlier PRs using --no-rebase.
-
-    1. Create first PR and update normally
-    2. Create second PR and update with --no-rebase
-    3. Verify earlier PR commit hash is preserved
-    4. Verify stack links updated properly
-    5. Verify CI not re-triggered (via commit hash check)
+def _no_rebase_stack(ctx: RepoContext) -> PullRequest:
+    """Build a two-PR stack where the second PR was added with --no-rebase.
+    
+    Verifies the first PR's hash was preserved and the stack is linked,
+    then returns the second PR.
     """
-    ctx = test_repo_ctx
     git_cmd = ctx.git_cmd
-    github = ctx.github
     repo_dir = ctx.repo_dir
 
     # Get initial commit hash for verification
-    initial_hash = git_cmd.must_git("rev-parse HEAD").strip()
+    initial_hash = git_cmd.short("rev-parse HEAD")
     log.info(f"Initial commit: {initial_hash[:8]}")
 
     # Create first commit & PR with test tag as a control case
     log.info("\nCreating first commit...")
     ctx.make_commit("nr_test1.txt", "First commit", "First commit")
-    c1_hash = git_cmd.must_git("rev-parse HEAD").strip()
+    c1_hash = git_cmd.short("rev-parse HEAD")
     log.info(f"First commit: {c1_hash[:8]}")
 
     # Create first PR and get its hash
-    run_cmd(f"pyspr update -C {repo_dir}")
-    pr1_hash = git_cmd.must_git("rev-parse HEAD").strip()
+    run_pyspr(["update", "-C", repo_dir])
+    pr1_hash = git_cmd.short("rev-parse HEAD")
     log.info(f"After update commit: {pr1_hash[:8]}")
 
-    # Get PR info more efficiently
-    info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-    assert info is not None, "GitHub info should not be None"
     # Get test PRs the standard way first to validate the flow
     prs = ctx.get_test_prs()
     assert len(prs) == 1, f"Should have 1 PR, found {len(prs)}"
@@ -1211,7 +1066,6 @@ def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
     # Note: We no longer capture hash here since it will change during PR creation
 
     # Create .spr.yaml with noRebase: true
-    import yaml  # Import needed only in this test
     spr_yaml_path = os.path.join(repo_dir, ".spr.yaml")
     spr_config: Dict[str, Union[Dict[str, str], Dict[str, bool]]] = {
         'repo': {
@@ -1229,7 +1083,7 @@ def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
 
     # Update with --no-rebase and verify output
     log.info("\nUpdating with --no-rebase...")
-    update_output = run_cmd(f"pyspr update -C {repo_dir} -nr -v")
+    update_output = run_pyspr(["update", "-C", repo_dir, "-nr", "-v"])
     log.info(f"Update output:\n{update_output}")
     assert update_output is not None, "Update output should not be None"
     assert "DEBUG: no_rebase=True" in update_output or \
@@ -1253,6 +1107,35 @@ def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
         f"PR1 hash changed: {pr1_hash[:8]} -> {pr1_after.commit.commit_hash[:8]}"
     log.info(f"Verified PR #{pr1_number} hash unchanged")
 
+    # Verify stack structure
+    assert pr1_after.base_ref == "main", f"PR1 should target main, got {pr1_after.base_ref}"
+    assert pr2.base_ref is not None and pr2.base_ref.startswith('pyspr/'), f"PR2 should target PR1's branch, got {pr2.base_ref}"
+    assert pr2.base_ref and pr1_after.commit.commit_id in pr2.base_ref, "PR2 should target PR1's branch"
+    log.info(f"Verified stack structure: #{pr1_number} <- #{pr2.number}")
+
+    return pr2
+
+@run_twice_in_mock_mode
+def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
+    """Test stacking new PRs on top without changing earlier PRs using --no-rebase.
+
+    1. Create first PR and update normally
+    2. Create second PR and update with --no-rebase
+    3. Verify earlier PR commit hash is preserved
+    4. Verify stack links updated properly
+    5. Verify CI not re-triggered (via commit hash check)
+    """
+    _no_rebase_stack(test_repo_ctx)
+
+@pytest.mark.slow
+@run_twice_in_mock_mode
+def test_no_rebase_pr_stacking_repeated_update(test_repo_ctx: RepoContext) -> None:
+    """Test that a further --no-rebase update leaves the second PR's hash alone."""
+    ctx = test_repo_ctx
+    git_cmd = ctx.git_cmd
+    repo_dir = ctx.repo_dir
+    pr2 = _no_rebase_stack(ctx)
+
     # Capture PR2's hash after creation
     pr2_hash = pr2.commit.commit_hash
     log.info(f"Captured PR #{pr2.number} hash: {pr2_hash[:8]}")
@@ -1263,11 +1146,10 @@ def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
 
     # Update again with --no-rebase
     log.info("\nUpdating again with --no-rebase...")
-    update_output = run_cmd(f"pyspr update -C {repo_dir} -nr -v")
+    run_pyspr(["update", "-C", repo_dir, "-nr", "-v"])
 
     # Get updated PR info again
     prs = sorted(ctx.get_test_prs(), key=lambda pr: pr.number)
-    pr1_after = next((pr for pr in prs if pr.number == pr1_number), None)
     pr2_after = next((pr for pr in prs if pr.number == pr2.number), None)
     assert pr2_after is not None, f"PR #{pr2.number} should still exist"
 
@@ -1277,13 +1159,6 @@ def test_no_rebase_pr_stacking(test_repo_ctx: RepoContext) -> None:
         f"PR2 hash changed: {pr2_hash[:8]} -> {pr2_after.commit.commit_hash[:8]}"
     log.info(f"Verified PR #{pr2.number} hash unchanged")
 
-    # Verify stack structure
-    assert pr1_after is not None, f"PR #{pr1_number} should exist after update"
-    assert pr1_after.base_ref == "main", f"PR1 should target main, got {pr1_after.base_ref}"
-    assert pr2.base_ref is not None and pr2.base_ref.startswith('pyspr/'), f"PR2 should target PR1's branch, got {pr2.base_ref}"
-    assert pr2.base_ref and pr1_after.commit.commit_id in pr2.base_ref, "PR2 should target PR1's branch"
-    log.info(f"Verified stack structure: #{pr1_number} <- #{pr2.number}")
-
     # Print final git log
     log_output = git_cmd.must_git("log --oneline -n 3")
     log.info(f"Final git log:\n{log_output}")
@@ -1313,12 +1188,14 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
         },
         'user': {}
     })  # Config constructor handles typing
-    git_cmd = RealGit(config)
+    git_cmd = CachingGit(config)
     github = GitHubClient(None, config)  # Real GitHub client
 
     # Create two unique tags for the two stacks
-    unique_tag1 = f"test-stack1-{uuid.uuid4().hex[:8]}"
-    unique_tag2 = f"test-stack2-{uuid.uuid4().hex[:8]}"
+    # Namespaced by xdist worker, as branches land on a shared remote in real GitHub mode
+    suffix = f"{xdist_worker_id()}-{uuid.uuid4().hex[:8]}"
+    unique_tag1 = f"test-stack1-{suffix}"
+    unique_tag2 = f"test-stack2-{suffix}"
 
     # Helper to make commit with unique test tag
     def make_commit(file: str, line: str, msg: str, stack_num: int) -> None:
@@ -1326,8 +1203,7 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
         full_msg = f"{msg} [test-tag:{tag}]"
         with open(file, "w") as f:
             f.write(f"{file}\n{line}\n")
-        run_cmd(f"git add {file}")
-        run_cmd(f'git commit -m "{full_msg}"')
+        run_cmds(f"git add {file}", f"git commit -m {shlex.quote(full_msg)}")
 
     # Initialize branch names
     branch1: str = ""
@@ -1337,10 +1213,8 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
 
     # 1. Create branch1 with 2 connected PRs
     log.info("Creating branch1 with 2-PR stack...")
-    run_cmd("git checkout main")
-    run_cmd("git pull")
-    branch1 = f"test-stack1-{uuid.uuid4().hex[:7]}"
-    run_cmd(f"git checkout -b {branch1}")
+    branch1 = f"test-stack1-{suffix}"
+    run_cmds("git fetch origin main", "git checkout -B main origin/main", f"git checkout -b {branch1}")
 
     # First commit for PR1A
     make_commit("stack1a.txt", "line 1", "Stack 1 commit A", 1)
@@ -1348,22 +1222,16 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
     make_commit("stack1b.txt", "line 1", "Stack 1 commit B", 1)
 
     # Save original hashes for cherry-pick operations
-    orig_c1a_hash = git_cmd.must_git("rev-parse HEAD~1").strip()  # noqa: F841
-    orig_c1b_hash = git_cmd.must_git("rev-parse HEAD").strip()    # noqa: F841
+    orig_c1b_hash = git_cmd.short("rev-parse HEAD")
 
     # Update to create connected PRs 1A and 1B
     log.info("Creating stack 1 PRs...")
-    run_cmd("pyspr update")
-
-    # Save hashes after update for verification
-    c1a_hash = git_cmd.must_git("rev-parse HEAD~1").strip()  # noqa: F841
-    c1b_hash = git_cmd.must_git("rev-parse HEAD").strip()    # noqa: F841
+    run_pyspr(["update"])
 
     # 2. Create branch2 with 2 connected PRs
     log.info("Creating branch2 with 2-PR stack...")
-    run_cmd("git checkout main")
-    branch2 = f"test-stack2-{uuid.uuid4().hex[:7]}"
-    run_cmd(f"git checkout -b {branch2}")
+    branch2 = f"test-stack2-{suffix}"
+    run_cmd(["git", "checkout", "-b", branch2, "main"])
 
     # First commit for PR2A
     make_commit("stack2a.txt", "line 1", "Stack 2 commit A", 2)
@@ -1372,30 +1240,12 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
 
     # Update to create connected PRs 2A and 2B
     log.info("Creating stack 2 PRs...")
-    run_cmd("pyspr update")
-
-    # Helper to find our test PRs
-    def get_test_prs() -> List[PullRequest]:
-        result: List[PullRequest] = []
-        info: Optional[GitHubInfo] = github.get_info(None, git_cmd)
-        if info is None:
-            return []
-        for pr in info.pull_requests:
-            if pr.from_branch and pr.from_branch.startswith('pyspr/'):
-                try:
-                    # Look for our unique tags in the commit message
-                    assert pr.commit is not None
-                    commit_msg: str = git_cmd.must_git(f"show -s --format=%B {pr.commit.commit_hash}")
-                    if f"test-tag:{unique_tag1}" in commit_msg or f"test-tag:{unique_tag2}" in commit_msg:
-                        result.append(pr)
-                except Exception:  # Skip failures since we're just filtering
-                    pass
-        return result
+    run_pyspr(["update"])
 
     # Verify all 4 PRs exist with correct connections
     log.info("Verifying initial state of PRs...")
     # Find our test PRs
-    test_prs = get_test_prs()
+    test_prs = get_test_prs(git_cmd, github, unique_tag1, unique_tag2)
     all_prs: Dict[str, Optional[PullRequest]] = {
         "1A": next((pr for pr in test_prs if "Stack 1 commit A" in pr.title), None),
         "1B": next((pr for pr in test_prs if "Stack 1 commit B" in pr.title), None),
@@ -1434,18 +1284,17 @@ def test_stack_isolation(test_repo: Tuple[str, str, str, str]) -> None:
 
     # 3. Remove commit from branch1
     log.info("Removing first commit from branch1...")
-    run_cmd(f"git checkout {branch1}")
-    run_cmd("git reset --hard HEAD~2")  # Remove both commits
-    run_cmd(f"git cherry-pick {orig_c1b_hash}")  # Add back just the second commit using original hash
+    # Drop both commits and add back just the second one (original hash) in one shell
+    run_cmds(f"git checkout {branch1}", "git reset --hard HEAD~2", f"git cherry-pick {orig_c1b_hash}")
     # Removed manual push, let pyspr update handle it
 
     # Run update in branch1
     log.info("Running update in branch1...")
-    run_cmd("pyspr update")
+    run_pyspr(["update"])
 
     # 4. Verify PR1A is closed, PR1B retargeted to main, while PR2A and PR2B remain untouched
     log.info("Verifying PR state after updates...")
-    test_prs = get_test_prs()
+    test_prs = get_test_prs(git_cmd, github, unique_tag1, unique_tag2)
     remaining_prs: Dict[int, str] = {}
     for pr in test_prs:
         assert pr.base_ref is not None, f"PR #{pr.number} has no base_ref"
@@ -1484,30 +1333,11 @@ def test_breakup_command(test_repo_ctx: RepoContext) -> None:
     """
     ctx = test_repo_ctx
     
-    # Define the dependency DAG (same as test_analyze)
-    dependencies = {
-        "A": [],  # Independent
-        "B": ["A"],  # Depends on A
-        "C": ["A"],  # Depends on A  
-        "D": ["A", "C"],  # Depends on both A and C
-        "E": ["C"],  # Depends on C
-        "F": [],  # Independent
-        "G": ["E", "F"],  # Depends on both E and F - should fail in breakup
-        "H": [],  # Independent
-        "I": ["H"],  # Depends on H
-        "J": ["H", "I"],  # Depends on both H and I
-        "K": [],  # Independent
-        "L": ["K"],  # Depends on K
-        "M": [],  # Independent
-    }
-    
-    # Create commits in topological order
-    commits_order = ["A", "F", "H", "K", "M", "B", "C", "I", "D", "E", "L", "J", "G"]
-    create_commits_from_dag(dependencies, commits_order)
+    # Create the shared breakup DAG (same as test_analyze)
+    create_commits_from_dag(_BREAKUP_DAG, _BREAKUP_DAG_ORDER)
     
     # Run breakup command
-    result = run_cmd("pyspr breakup", capture_output=True)
-    breakup_output = str(result)
+    breakup_output = run_pyspr(["breakup"])
     log.info(f"Breakup output:\n{breakup_output}")
     
     # Get created PRs
@@ -1518,14 +1348,13 @@ def test_breakup_command(test_repo_ctx: RepoContext) -> None:
     prs = [pr for pr in info.pull_requests if pr.from_branch and pr.from_branch.startswith("pyspr/")]
     log.info(f"Found {len(prs)} breakup PRs")
     
-    # Extract which commits got PRs
-    commits_with_prs: Set[str] = set()
+    # Map commit name (from the PR title) to PR in one pass, for easy lookup
+    pr_by_commit: Dict[str, PullRequest] = {}
     for pr in prs:
-        # Extract commit name from PR title
-        for commit_name in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M"]:
-            if commit_name in pr.title:
-                commits_with_prs.add(commit_name)
-                break
+        name = _dag_commit_name(pr.title)
+        if name:
+            pr_by_commit[name] = pr
+    commits_with_prs = set(pr_by_commit)
     
     log.info(f"Commits with PRs: {sorted(commits_with_prs)}")
     
@@ -1547,7 +1376,7 @@ def test_breakup_command(test_repo_ctx: RepoContext) -> None:
         f"All independent commits {expected_independent_prs} must have PRs, but only found {commits_with_prs}"
     
     # Verify multi-parent commits did NOT get PRs (they should fail cherry-pick)
-    commits_without_prs = set(["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M"]) - commits_with_prs
+    commits_without_prs = set(_BREAKUP_DAG) - commits_with_prs
     for commit in expected_no_prs:
         if commit not in commits_without_prs:
             log.warning(f"Expected {commit} to fail cherry-pick, but it got a PR")
@@ -1557,17 +1386,9 @@ def test_breakup_command(test_repo_ctx: RepoContext) -> None:
         f"Should create at least {len(expected_independent_prs)} PRs for independent commits, found {len(prs)}"
     
     # Verify PR properties - WITHOUT --stacks flag, all PRs should target main
-    pr_by_commit = {}  # Map commit name to PR for easy lookup
+    # (prs is already filtered to pyspr/ branches above)
     for pr in prs:
-        assert pr.from_branch and pr.from_branch.startswith("pyspr/"), \
-            f"PR branch should start with pyspr/, got {pr.from_branch}"
         assert pr.base_ref == "main", f"All breakup PRs (without --stacks) should target main, got {pr.base_ref} for {pr.title}"
-        
-        # Map commit to PR
-        for commit_name in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M"]:
-            if commit_name in pr.title:
-                pr_by_commit[commit_name] = pr
-                break
     
     # Verify each independent PR has the correct structure
     for commit_name in expected_independent_prs:
@@ -1614,30 +1435,11 @@ def test_breakup_stacks_command(test_repo_ctx: RepoContext) -> None:
     """
     ctx = test_repo_ctx
     
-    # Use the same DAG structure from test_analyze
-    dependencies = {
-        "A": [],  # Independent
-        "B": ["A"],  # Depends on A
-        "C": ["A"],  # Depends on A  
-        "D": ["A", "C"],  # Depends on both A and C
-        "E": ["C"],  # Depends on C
-        "F": [],  # Independent
-        "G": ["E", "F"],  # Depends on both E and F - should be orphan
-        "H": [],  # Independent
-        "I": ["H"],  # Depends on H
-        "J": ["H", "I"],  # Depends on both H and I
-        "K": [],  # Independent
-        "L": ["K"],  # Depends on K
-        "M": [],  # Independent
-    }
-    
-    # Create commits in topological order
-    commits_order = ["A", "F", "H", "K", "M", "B", "C", "I", "D", "E", "L", "J", "G"]
-    create_commits_from_dag(dependencies, commits_order)
+    # Create the shared breakup DAG (same as test_analyze)
+    create_commits_from_dag(_BREAKUP_DAG, _BREAKUP_DAG_ORDER)
     
     # Run breakup --stacks command
-    result = run_cmd("pyspr breakup --stacks", capture_output=True)
-    breakup_output = str(result)
+    breakup_output = run_pyspr(["breakup", "--stacks"])
     log.info(f"Breakup --stacks output:\n{breakup_output}")
     
     # Get created PRs
@@ -1651,10 +1453,9 @@ def test_breakup_stacks_command(test_repo_ctx: RepoContext) -> None:
     # Build a map of commit to PR
     pr_by_commit: Dict[str, PullRequest] = {}
     for pr in prs:
-        for commit_name in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M"]:
-            if commit_name in pr.title:
-                pr_by_commit[commit_name] = pr
-                break
+        name = _dag_commit_name(pr.title)
+        if name:
+            pr_by_commit[name] = pr
     
     log.info(f"Created PRs for commits: {sorted(pr_by_commit.keys())}")
     
@@ -1726,12 +1527,8 @@ def test_breakup_stacks_command(test_repo_ctx: RepoContext) -> None:
     log.info(f"✓ Breakup --stacks created {len(prs)} PRs in {len(root_prs)} stacks")
     log.info("✓ Stack structures verified:")
     for root_pr in sorted(root_prs, key=lambda pr: pr.title):
-        commit_name = None
-        for name in ["A", "F", "H", "K", "M"]:
-            if name in root_pr.title:
-                commit_name = name
-                break
-        if commit_name:
+        commit_name = _dag_commit_name(root_pr.title)
+        if commit_name in ("A", "F", "H", "K", "M"):
             log.info(f"  - Stack rooted at {commit_name}")
     log.info("✓ All PRs have correct base branches reflecting stack structure")
 
@@ -1743,15 +1540,15 @@ def test_breakup_with_existing_prs(test_repo_ctx: RepoContext) -> None:
     # Create commits with unique filenames to avoid conflicts
     unique_suffix = str(uuid.uuid4())[:8]
     ctx.make_commit(f"file1_{unique_suffix}.txt", "content1", "First commit")
-    ctx.git_cmd.must_git("rev-parse HEAD").strip()
     
     ctx.make_commit(f"file2_{unique_suffix}.txt", "content2", "Second commit")
-    ctx.git_cmd.must_git("rev-parse HEAD").strip()
     
     # Run breakup once - this will add commit-ids to the commits
-    run_cmd("pyspr breakup")
+    run_pyspr(["breakup"])
     
-    # Get initial PRs
+    # Get initial PRs. These can't be carried over from a previous
+    # run_twice_in_mock_mode pass: each pass makes fresh commits (new
+    # commit-ids) on a branch reset to origin/main, so its PRs are new too.
     info = ctx.github.get_info(None, ctx.git_cmd)
     assert info is not None, "Should get GitHub info"
     initial_prs = [pr for pr in info.pull_requests if pr.from_branch and pr.from_branch.startswith("pyspr/")]
@@ -1761,23 +1558,21 @@ def test_breakup_with_existing_prs(test_repo_ctx: RepoContext) -> None:
     # Save initial PR numbers
     initial_pr_numbers = {pr.number for pr in initial_prs}
     
-    # Get the updated commit hashes after breakup (which added commit-ids)
-    ctx.git_cmd.must_git("rev-parse HEAD~1").strip()
-    updated_commit2_hash = ctx.git_cmd.must_git("rev-parse HEAD").strip()
+    # Get the updated commit hashes after breakup (which added commit-ids), and the
+    # first commit's message to preserve its commit-id, in one git call
+    commits = ctx.git_cmd.batch_read_commits(["HEAD", "HEAD~1"])
+    updated_commit2_hash = commits["HEAD"][0]
+    existing_msg = commits["HEAD~1"][1].strip()
     
     # Modify the first commit
-    run_cmd("git checkout HEAD~1")
-    # Get existing commit message to preserve commit-id
-    existing_msg = ctx.git_cmd.must_git("log -1 --format=%B").strip()
-    run_cmd(f"echo 'updated' >> file1_{unique_suffix}.txt")
-    run_cmd(f"git add file1_{unique_suffix}.txt")
+    run_cmd(["git", "checkout", "HEAD~1"])
+    with open(f"file1_{unique_suffix}.txt", "a") as f:
+        f.write("updated\n")
     # Amend but preserve the commit-id tag
     updated_msg = existing_msg.replace("First commit", "First commit - updated")
-    run_cmd(f"git commit --amend -m '{updated_msg}'")
-    ctx.git_cmd.must_git("rev-parse HEAD").strip()
-    
-    # Cherry-pick second commit using the UPDATED hash that has commit-id
-    run_cmd(f"git cherry-pick {updated_commit2_hash}")
+    # Amend, then cherry-pick second commit using the UPDATED hash that has commit-id
+    run_cmds(f"git add file1_{unique_suffix}.txt", f"git commit --amend -m {shlex.quote(updated_msg)}",
+             f"git cherry-pick {updated_commit2_hash}")
     
     # Debug: Check if commit-id was preserved
     cherry_picked_msg = ctx.git_cmd.must_git("log -1 --format=%B").strip()
@@ -1785,81 +1580,47 @@ def test_breakup_with_existing_prs(test_repo_ctx: RepoContext) -> None:
     assert "commit-id:" in cherry_picked_msg, "commit-id should be preserved during cherry-pick"
     
     # Run breakup again
-    run_cmd("pyspr breakup")
-    
-    # Get all PRs from GitHub (not just ones matching our current commits)
-    # We need to access the repo directly to get ALL PRs, not just those matching local commits
-    repo = ctx.github.repo
-    assert repo is not None, "Should have GitHub repo"
+    run_pyspr(["breakup"])
     
-    # Get all open PRs from the repository
-    all_open_prs = list(repo.get_pulls(state='open'))
-    log.info(f"Total open PRs in repo: {len(all_open_prs)}")
+    # Get all open PRs from GitHub (not just ones matching our current commits)
+    all_open_prs = ctx.github.get_open_pull_requests(ctx.git_cmd)
+    # Log with %-style args so messages are only formatted when INFO is enabled
+    log.info("Total open pyspr PRs in repo: %d", len(all_open_prs))
     for pr in all_open_prs:
-        log.info(f"  PR #{pr.number}: branch={pr.head.ref}, state={pr.state}")
-    
-    # Filter to pyspr PRs for this test - check for test tag
-    all_pyspr_prs: List[PullRequest] = []
-    for pr in all_open_prs:
-        if pr.head.ref.startswith("pyspr/"):
-            # Check if this PR belongs to our test by looking for test tag in title
-            # (body might not always have the tag, but title always does)
-            tag_to_find = f"test-tag:{ctx.tag}"
-            if tag_to_find in pr.title:
-                log.info(f"Found PR #{pr.number} with our tag")
-                # Extract commit ID from branch name
-                branch_parts = pr.head.ref.split('/')
-                commit_id = branch_parts[-1] if len(branch_parts) > 3 else 'unknown'
-                
-                # Create a simple commit object
-                commit = Commit.from_strings(commit_id, pr.head.sha, pr.title)
-                
-                # Create PullRequest object that matches our test expectations
-                pr_obj = PullRequest(
-                    number=pr.number,
-                    commit=commit,
-                    commits=[commit],
-                    base_ref=pr.base.ref,
-                    from_branch=pr.head.ref,
-                    in_queue=False,
-                    title=pr.title,
-                    body=pr.body
-                )
-                all_pyspr_prs.append(pr_obj)
-    
-    log.info(f"Found {len(all_pyspr_prs)} pyspr PRs total")
-    for pr in all_pyspr_prs:
-        log.info(f"  PR #{pr.number}: branch={pr.from_branch}, title={pr.title}")
+        log.info("  PR #%d: branch=%s", pr.number, pr.from_branch)
     
     # Get the expected branch names from initial PRs
     initial_branches = {pr.from_branch for pr in initial_prs}
     log.info(f"Initial PR branches: {initial_branches}")
     
-    # We expect at least 2 PRs (could be more from previous runs with run_twice)
-    # Filter to just the PRs we care about - ones that match our current commits
-    current_run_prs: List[PullRequest] = []
+    # We expect exactly 2 PRs for the current run (more may be open from a
+    # previous run_twice pass). Keep PRs whose number or branch matches an
+    # initial PR - cheap set lookups, checked first - and whose title carries
+    # this test's tag (body might not always have the tag, but title always does)
+    all_pyspr_prs = [
+        pr for pr in all_open_prs
+        if (pr.number in initial_pr_numbers or pr.from_branch in initial_branches)
+        and commit_tag(pr.title) == ctx.tag
+    ]
     for pr in all_pyspr_prs:
-        # Check if this PR's branch matches one of our initial PRs or 
-        # if its commit matches our current commits
-        if pr.from_branch in initial_branches or pr.number in initial_pr_numbers:
-            current_run_prs.append(pr)
+        log.info("  PR #%d: branch=%s, title=%s", pr.number, pr.from_branch, pr.title)
     
-    assert len(current_run_prs) == 2, f"Should have exactly 2 pyspr PRs for current run, found {len(current_run_prs)}"
-    all_pyspr_prs = current_run_prs  # Use filtered list for rest of test
+    assert len(all_pyspr_prs) == 2, f"Should have exactly 2 pyspr PRs for current run, found {len(all_pyspr_prs)}"
     
     # Sort PRs by number to make it easier to identify them
     all_pyspr_prs.sort(key=lambda pr: pr.number)
     
     # Verify we have the expected PRs
+    found = ctx.get_prs_by_title_fragment("First commit - updated", "Second commit", prs=all_pyspr_prs)
     # Find PR for first commit - it should have the updated title
-    pr_first = next((pr for pr in all_pyspr_prs if "First commit - updated" in pr.title), None)
+    pr_first = found["First commit - updated"]
     assert pr_first is not None, "Should find PR for first commit with updated title"
     assert pr_first.number in initial_pr_numbers, "First commit PR should be from initial PRs"
     assert "First commit - updated" in pr_first.title, f"PR title should be updated to match new commit message, got: {pr_first.title}"
     log.info(f"First commit PR #{pr_first.number} was correctly reused with updated title: {pr_first.title}")
     
     # Find PR for second commit
-    pr_second = next((pr for pr in all_pyspr_prs if "Second commit" in pr.title), None)
+    pr_second = found["Second commit"]
     assert pr_second is not None, "Should find PR for second commit"
     assert pr_second.number in initial_pr_numbers, "Second commit PR should be from initial PRs"
     assert pr_second.from_branch in initial_branches, f"Second commit PR should have original branch, got {pr_second.from_branch}"
@@ -1867,7 +1628,7 @@ def test_breakup_with_existing_prs(test_repo_ctx: RepoContext) -> None:
     
     log.info(f"Success: Both commits reused their PRs - PR #{pr_first.number} and PR #{pr_second.number}")
 
-@run_twice_in_mock_mode
+@run_twice_in_mock_mode(read_only=True)
 def test_breakup_pretend_mode(test_repo_ctx: RepoContext, capsys: pytest.CaptureFixture[str]) -> None:
     """Test breakup command in pretend mode."""
     ctx = test_repo_ctx
@@ -1877,7 +1638,7 @@ def test_breakup_pretend_mode(test_repo_ctx: RepoContext, capsys: pytest.Capture
     ctx.make_commit("file2.txt", "content2", "Second commit")
     
     # Run breakup in pretend mode - capture both stdout and stderr
-    output = run_cmd("pyspr breakup --pretend -v 2>&1", cwd=ctx.repo_dir)
+    output = run_pyspr(["breakup", "--pretend", "-v"], cwd=ctx.repo_dir, merge_stderr=True)
     
     # Check output shows pretend actions
     assert "[PRETEND]" in output, f"Should show pretend mode indicators. Got output: {output[:500]}..."
@@ -1888,9 +1649,10 @@ def test_breakup_pretend_mode(test_repo_ctx: RepoContext, capsys: pytest.Capture
         prs = [pr for pr in info.pull_requests if pr.from_branch and pr.from_branch.startswith("pyspr/")]
         assert len(prs) == 0, "Should not create actual PRs in pretend mode"
     
-    # Verify no branches were created
-    branches = run_cmd("git branch -a")
-    assert "pyspr/" not in branches, "Should not create branches in pretend mode"
+    # Verify no branches were created, local or pushed; --count=1 stops at the first match
+    leaked = run_cmd(["git", "for-each-ref", "--count=1", "--format=%(refname)",
+                      "refs/heads/pyspr/", "refs/remotes/origin/pyspr/"])
+    assert not leaked.strip(), f"Should not create branches in pretend mode, found {leaked.strip()}"
 
 @run_twice_in_mock_mode
 def test_breakup_preserves_unchanged_commit_hashes(test_repo_ctx: RepoContext) -> None:
@@ -1903,7 +1665,7 @@ def test_breakup_preserves_unchanged_commit_hashes(test_repo_ctx: RepoContext) -
     ctx.make_commit(f"file2_{unique_suffix}.txt", "content2", "Second commit")
     
     # Initial breakup
-    run_cmd("pyspr breakup")
+    run_pyspr(["breakup"])
     
     # Get the branch name and hash for the second commit
     info = ctx.github.get_info(None, ctx.git_cmd)
@@ -1915,28 +1677,31 @@ def test_breakup_preserves_unchanged_commit_hashes(test_repo_ctx: RepoContext) -
     second_pr = next((pr for pr in prs if "Second commit" in pr.title), None)
     assert second_pr is not None, "Should find PR for second commit"
     second_branch_name = second_pr.from_branch
+    assert second_branch_name is not None, "Second commit PR should have a branch"
     
-    # Get the SHA of the second commit's branch after initial breakup
-    initial_second_branch_sha = ctx.git_cmd.must_git(f"rev-parse {second_branch_name}").strip()
+    # Get the SHA of the second commit's branch after initial breakup, along with
+    # the first commit's message for the amend below
+    commits = ctx.git_cmd.batch_read_commits([second_branch_name, "HEAD~1"])
+    initial_second_branch_sha = commits[second_branch_name][0]
+    existing_msg = commits["HEAD~1"][1].strip()
     log.info(f"Initial SHA for second commit branch {second_branch_name}: {initial_second_branch_sha}")
     
     # Test 1: Amend only the first commit (tree comparison test)
-    run_cmd("git checkout HEAD~1")
-    existing_msg = ctx.git_cmd.must_git("log -1 --format=%B").strip()
-    run_cmd(f"echo 'updated' >> file1_{unique_suffix}.txt")
-    run_cmd(f"git add file1_{unique_suffix}.txt")
-    run_cmd(f"git commit --amend -m '{existing_msg.replace('First commit', 'First commit - updated')}'")
-    
-    # Cherry-pick the second commit to preserve the stack
-    # Get the commit with the commit-id from the local branch
-    run_cmd(f"git cherry-pick {second_branch_name}")
+    run_cmd(["git", "checkout", "HEAD~1"])
+    with open(f"file1_{unique_suffix}.txt", "a") as f:
+        f.write("updated\n")
+    updated_msg = existing_msg.replace("First commit", "First commit - updated")
+    # Amend, then cherry-pick the second commit (with its commit-id, from the
+    # local branch) to preserve the stack
+    run_cmds(f"git add file1_{unique_suffix}.txt", f"git commit --amend -m {shlex.quote(updated_msg)}",
+             f"git cherry-pick {second_branch_name}")
     
     # Run breakup again with verbose output
-    output = run_cmd("pyspr breakup -v 2>&1", cwd=ctx.repo_dir)
+    output = run_pyspr(["breakup", "-v"], cwd=ctx.repo_dir, merge_stderr=True)
     log.info(f"Breakup output:\n{output}")
     
     # Get the SHA of the second commit's branch after second breakup
-    final_second_branch_sha = ctx.git_cmd.must_git(f"rev-parse {second_branch_name}").strip()
+    final_second_branch_sha = ctx.git_cmd.short(f"rev-parse {second_branch_name}")
     log.info(f"Final SHA for second commit branch {second_branch_name}: {final_second_branch_sha}")
     
     # Verify the second commit's branch hash hasn't changed
@@ -1952,20 +1717,17 @@ def test_breakup_preserves_unchanged_commit_hashes(test_repo_ctx: RepoContext) -
     
     # Test 2: Test when base changes but diff remains the same
     # First, go back to the original main branch
-    run_cmd("git checkout main")
-    run_cmd("git pull origin main")
+    run_cmds("git fetch origin main", "git checkout -B main origin/main")
     
     # Add a line at the beginning of README.md (a file that exists on main)
-    run_cmd("echo 'line at beginning' | cat - README.md > temp && mv temp README.md")
-    run_cmd("git add README.md")
-    run_cmd("git commit -m 'Add line at beginning of README'")
-    run_cmd("git push origin main")
+    prepend_line("README.md", "line at beginning")
+    run_cmds("git add README.md", "git commit -m 'Add line at beginning of README'", "git push origin main")
     
     # Create a simple commit that adds a new file (use same unique suffix)
     ctx.make_commit(f"file3_{unique_suffix}.txt", "content3", "Third commit")
     
     # Run breakup to create branch for third commit
-    run_cmd("pyspr breakup")
+    run_pyspr(["breakup"])
     
     # Get info about the third commit's branch
     info = ctx.github.get_info(None, ctx.git_cmd)
@@ -1973,28 +1735,23 @@ def test_breakup_preserves_unchanged_commit_hashes(test_repo_ctx: RepoContext) -
     third_pr = next((pr for pr in info.pull_requests if "Third commit" in pr.title), None)
     assert third_pr is not None, "Should find PR for third commit"
     third_branch_name = third_pr.from_branch
-    third_branch_sha = ctx.git_cmd.must_git(f"rev-parse {third_branch_name}").strip()
+    third_branch_sha = ctx.git_cmd.short(f"rev-parse {third_branch_name}")
     log.info(f"Initial SHA for third commit branch {third_branch_name}: {third_branch_sha}")
     
     # Now update main again (this simulates base moving forward)
-    run_cmd("git checkout main")
-    run_cmd("git pull origin main")
-    run_cmd("echo 'another line at beginning' | cat - README.md > temp && mv temp README.md")
-    run_cmd("git add README.md")
-    run_cmd("git commit -m 'Add another line at beginning of README'")
-    run_cmd("git push origin main")
+    run_cmds("git fetch origin main", "git checkout -B main origin/main")
+    prepend_line("README.md", "another line at beginning")
+    run_cmds("git add README.md", "git commit -m 'Add another line at beginning of README'", "git push origin main")
     
     # Go back to test_local and rebase to get the new main
-    run_cmd("git checkout test_local")
-    run_cmd("git fetch")
-    run_cmd("git rebase origin/main")
+    run_cmds("git checkout test_local", "git fetch", "git rebase origin/main")
     
     # Run breakup again - the diff for third commit is the same (adding file3.txt)
-    output = run_cmd("pyspr breakup -v 2>&1", cwd=ctx.repo_dir)
+    output = run_pyspr(["breakup", "-v"], cwd=ctx.repo_dir, merge_stderr=True)
     log.info(f"Breakup output after base change:\n{output}")
     
     # Get the SHA after breakup
-    final_third_branch_sha = ctx.git_cmd.must_git(f"rev-parse {third_branch_name}").strip()
+    final_third_branch_sha = ctx.git_cmd.short(f"rev-parse {third_branch_name}")
     log.info(f"Final SHA for third commit branch {third_branch_name}: {final_third_branch_sha}")
     
     # With the new behavior, the branch should NOT be updated since the diff is the same
@@ -2016,35 +1773,30 @@ def test_breakup_pr_already_exists_error(test_repo_ctx: RepoContext) -> None:
     ctx.make_commit("file1.txt", "content1", "Test commit for PR exists")
     
     # Run breakup once to create the PR
-    run_cmd("pyspr breakup")
-    
-    # Get the PR info
-    info = ctx.github.get_info(None, ctx.git_cmd)
-    assert info is not None
-    [pr for pr in info.pull_requests if pr.from_branch and pr.from_branch.startswith("pyspr/")]
+    run_pyspr(["breakup"])
     
-    # We should have 0 breakup PRs in the regular PR list (they're not part of the stack)
-    # But let's check via the repo directly
-    repo = ctx.github.repo
-    assert repo is not None
-    
-    all_prs = list(repo.get_pulls(state='open'))
-    initial_breakup_prs = [pr for pr in all_prs if pr.head.ref.startswith("pyspr/")]
+    # Breakup PRs aren't part of the local stack, so list all open pyspr PRs
+    initial_breakup_prs = ctx.github.get_open_pull_requests(ctx.git_cmd)
     initial_count = len(initial_breakup_prs)
     assert initial_count >= 1, f"Should have created at least 1 breakup PR, found {initial_count}"
     
-    log.info(f"Initial breakup PRs: {[(pr.number, pr.head.ref) for pr in initial_breakup_prs]}")
+    log.info(f"Initial breakup PRs: {[(pr.number, pr.from_branch) for pr in initial_breakup_prs]}")
     
     # Now simulate the scenario where GitHub API would return "PR already exists"
     # by running breakup again without any changes
-    run_cmd("pyspr breakup")
+    output = run_pyspr(["breakup"], merge_stderr=True)
+    
+    # Nothing changed, so the branch is left as is and not pushed again
+    assert "already up to date (same content)" in output, f"Branch should be unchanged. Got: {output}"
+    assert "already pushed" in output, f"Unchanged branch should skip the push. Got: {output}"
+    assert "nothing to push" in output and "Pushing" not in output, \
+        f"Push summary should report nothing was pushed. Got: {output}"
     
     # Check that we didn't create duplicate PRs
-    all_prs_after = list(repo.get_pulls(state='open'))
-    final_breakup_prs = [pr for pr in all_prs_after if pr.head.ref.startswith("pyspr/")]
+    final_breakup_prs = ctx.github.get_open_pull_requests(ctx.git_cmd)
     final_count = len(final_breakup_prs)
     
-    log.info(f"Final breakup PRs: {[(pr.number, pr.head.ref) for pr in final_breakup_prs]}")
+    log.info(f"Final breakup PRs: {[(pr.number, pr.from_branch) for pr in final_breakup_prs]}")
     
     # We should have the same number of PRs (no duplicates created)
     assert final_count == initial_count, \
@@ -2053,46 +1805,33 @@ def test_breakup_pr_already_exists_error(test_repo_ctx: RepoContext) -> None:
     log.info("Successfully verified breakup handles existing PRs without creating duplicates")
 
 
-@run_twice_in_mock_mode
+@run_twice_in_mock_mode(read_only=True)
 def test_analyze(test_repo_ctx: RepoContext) -> None:
     """Test the analyze command that identifies independent commits."""
     log.info("=== TEST ANALYZE STARTED ===")
     ctx = test_repo_ctx
-    git_cmd = ctx.git_cmd
-    
-    # Create a set of commits where some are independent and some are dependent
-    # First create a base file that will be modified by multiple commits
-    ctx.make_commit("base.txt", "line1\nline2\nline3\nline4\nline5\n", "Initial base file")
     
-    # Get the actual filename with suffix that was created
-    tag_suffix = ctx.tag.split('-')[-1][:8]  # Use last 8 chars of tag
-    base_filename = f"base.txt.{tag_suffix}"
-    
-    # Create an independent commit (modifies a different file)
-    ctx.make_commit("independent1.txt", "independent content", "Independent commit 1")
-    
-    # Create a dependent commit (modifies base.txt in a way that depends on initial state)
-    base_content = git_cmd.must_git(f"show HEAD~1:{base_filename}")
+    # Create a set of commits where some are independent and some are dependent.
+    # All of them are written by one fast-import stream instead of an add and
+    # commit each; only their contents matter to analyze
+    base_filename, independent1, independent2, wip = (
+        ctx.unique_file(f) for f in ("base.txt", "independent1.txt", "independent2.txt", "wip.txt"))
+    # A base file that will be modified by multiple commits
+    base_content = "line1\nline2\nline3\nline4\nline5\n"
+    # A dependent commit modifies it in a way that depends on the initial state,
+    # and another one modifies the same line again, so it will conflict
     modified_base = base_content.replace("line2", "modified-line2")
-    # Write to the actual base file with suffix
-    with open(base_filename, "w") as f:
-        f.write(modified_base)
-    run_cmd(f"git add {base_filename}")
-    run_cmd(f'git commit -m "Dependent commit - modify line 2 [test-tag:{ctx.tag}]"')
-    
-    # Create another dependent commit (modifies the same line, will conflict)
-    base_content2 = git_cmd.must_git(f"show HEAD:{base_filename}")
-    modified_base2 = base_content2.replace("line3", "another-modified-line3")
-    with open(base_filename, "w") as f:
-        f.write(modified_base2)
-    run_cmd(f"git add {base_filename}")
-    run_cmd(f'git commit -m "Dependent commit - modify line 3 [test-tag:{ctx.tag}]"')
-    
-    # Create another independent commit
-    ctx.make_commit("independent2.txt", "more independent content", "Independent commit 2")
-    
-    # Create a WIP commit (should be ignored by analyze)
-    ctx.make_commit("wip.txt", "work in progress", "WIP: Work in progress")
+    modified_base2 = modified_base.replace("line3", "another-modified-line3")
+    fast_import_commits([
+        (f"Initial base file [test-tag:{ctx.tag}]", {base_filename: base_content}),
+        # Independent commits modify a different file
+        (f"Independent commit 1 [test-tag:{ctx.tag}]", {independent1: "independent content\n"}),
+        (f"Dependent commit - modify line 2 [test-tag:{ctx.tag}]", {base_filename: modified_base}),
+        (f"Dependent commit - modify line 3 [test-tag:{ctx.tag}]", {base_filename: modified_base2}),
+        (f"Independent commit 2 [test-tag:{ctx.tag}]", {independent2: "more independent content\n"}),
+        # A WIP commit (should be ignored by analyze)
+        (f"WIP: Work in progress [test-tag:{ctx.tag}]", {wip: "work in progress\n"}),
+    ], cwd=ctx.repo_dir)
     
     # Run analyze command
     log.info("Running pyspr analyze...")
@@ -2129,7 +1868,7 @@ def test_analyze(test_repo_ctx: RepoContext) -> None:
     log.info("=== TEST ANALYZE COMPLETED SUCCESSFULLY ===")
 
 
-@run_twice_in_mock_mode
+@run_twice_in_mock_mode(read_only=True)
 def test_analyze_no_commits(test_repo_ctx: RepoContext) -> None:
     """Test analyze command with no commits."""
     log.info("=== TEST ANALYZE NO COMMITS STARTED ===")
@@ -2143,7 +1882,7 @@ def test_analyze_no_commits(test_repo_ctx: RepoContext) -> None:
     log.info("=== TEST ANALYZE NO COMMITS COMPLETED SUCCESSFULLY ===")
 
 
-@run_twice_in_mock_mode
+@run_twice_in_mock_mode(read_only=True)
 def test_analyze_only_wip(test_repo_ctx: RepoContext) -> None:
     """Test analyze command with only WIP commits."""
     log.info("=== TEST ANALYZE ONLY WIP STARTED ===")
@@ -2180,7 +1919,7 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     
     # Step 2: Run breakup --stacks to create initial PRs
     log.info("Step 2: Running initial breakup --stacks...")
-    output = run_cmd("pyspr breakup --stacks -v")
+    output = run_pyspr(["breakup", "--stacks", "-v"])
     log.info(f"Initial breakup output:\n{output}")
     
     # Should create two single-commit PRs
@@ -2191,8 +1930,8 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     assert len(prs_before) == 2, f"Expected 2 PRs, got {len(prs_before)}"
     
     # Find PR A and PR B
-    pr_a = next((pr for pr in prs_before if "Add a" in pr.title), None)
-    pr_b = next((pr for pr in prs_before if "Add b" in pr.title), None)
+    found = ctx.get_prs_by_title_fragment("Add a", "Add b", prs=prs_before)
+    pr_a, pr_b = found["Add a"], found["Add b"]
     assert pr_a, "Could not find PR for commit A"
     assert pr_b, "Could not find PR for commit B"
     
@@ -2207,17 +1946,16 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     # Step 3: Amend commit B to depend on commit A by modifying a.txt
     log.info("Step 3: Amending commit B to depend on commit A...")
     
-    # Get the actual filename for a.txt with tag suffix
-    files = git_cmd.must_git("ls-tree --name-only -r HEAD").strip().split('\n')
-    a_file = next((f for f in files if f.startswith("a.txt")), None)
+    # Get the actual filename for a.txt with tag suffix. The working tree is
+    # clean, so the checkout has exactly HEAD's files and no git call is needed
+    a_file = next((f for f in os.listdir(ctx.repo_dir) if f.startswith("a.txt")), None)
     assert a_file, "Could not find a.txt file"
     
     # Get the original commit message with commit-id
-    original_b_msg = git_cmd.must_git("log -1 --format=%B HEAD").strip()
+    original_b_msg = git_cmd.batch_show_messages(["HEAD"])["HEAD"].strip()
     
     # Update the message but preserve the commit-id
-    import re
-    commit_id_match = re.search(r'commit-id:([a-f0-9]{8})', original_b_msg)
+    commit_id_match = _COMMIT_ID_RE.search(original_b_msg)
     if commit_id_match:
         # Replace the subject line but keep the commit-id
         new_msg = f"Commit B: Create file b and modify a [test-tag:{ctx.tag}]\n\ncommit-id:{commit_id_match.group(1)}"
@@ -2226,20 +1964,16 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
         # Fallback if no commit-id found
         new_msg = f"Commit B: Create file b and modify a [test-tag:{ctx.tag}]"
     
-    # Amend to add dependency on A by modifying a.txt
-    a_content = git_cmd.must_git(f"show HEAD:{a_file}").strip()
-    with open(a_file, "w") as f:
-        f.write(f"{a_content}\nModified by B\n")
+    # Amend to add dependency on A by modifying a.txt (same as HEAD's copy)
+    a_path = Path(ctx.repo_dir, a_file)
+    a_content = a_path.read_text().strip()
+    a_path.write_text(f"{a_content}\nModified by B\n")
     
-    run_cmd(f"git add {a_file}")
-    
-    # Use proper escaping for the commit message
-    import shlex
-    git_cmd.must_git(f"commit --amend -m {shlex.quote(new_msg)}")
+    run_cmds(f"git add {shlex.quote(a_file)}", f"git commit --amend -m {shlex.quote(new_msg)}")
     
     # Step 4: Run breakup --stacks again
     log.info("Step 4: Running breakup --stacks after amendment...")
-    output2 = run_cmd("pyspr breakup --stacks -v")
+    output2 = run_pyspr(["breakup", "--stacks", "-v"])
     log.info(f"Second breakup output:\n{output2}")
     
     # Should now recognize them as a multi-commit stack
@@ -2268,15 +2002,10 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     max_pr_num = max(all_pr_numbers)
     assert max_pr_num <= pr_b_num, f"No new PRs should be created. Original max was #{pr_b_num}, but found #{max_pr_num}"
     
-    # Re-fetch PR data to get updated bodies (fake GitHub might have stale data)
-    if hasattr(ctx.github, 'repo') and ctx.github.repo:
-        gh_pr_a = ctx.github.repo.get_pull(pr_a_num)
-        gh_pr_b = ctx.github.repo.get_pull(pr_b_num)
-        pr_a_body = gh_pr_a.body
-        pr_b_body = gh_pr_b.body
-    else:
-        pr_a_body = pr_a_after.body
-        pr_b_body = pr_b_after.body
+    # get_test_prs fetched every open PR, bodies included, in one GraphQL search
+    # after breakup ran, so no per-PR re-fetch is needed for the updated bodies
+    pr_a_body = pr_a_after.body
+    pr_b_body = pr_b_after.body
     
     # Key assertion: BOTH PRs should now show stack information
     log.info(f"PR A body after update:\n{pr_a_body}")
@@ -2284,12 +2013,10 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     
     # CRITICAL: Bottom-of-stack PR (PR A) MUST have stack information
     # This is the main fix - previously bottom PRs were not updated
-    assert "Stack" in pr_a_body, f"BOTTOM-OF-STACK PR A must have stack info, but has: {pr_a_body}"
-    assert "**Stack**:" in pr_a_body, f"PR A should have formatted stack section, but has: {pr_a_body}"
+    assert "**Stack**:" in pr_a_body, f"BOTTOM-OF-STACK PR A must have a formatted stack section, but has: {pr_a_body}"
     
     # Top-of-stack PR should also have stack info
-    assert "Stack" in pr_b_body, f"PR B should now have stack info, but has: {pr_b_body}"
-    assert "**Stack**:" in pr_b_body, f"PR B should have formatted stack section, but has: {pr_b_body}"
+    assert "**Stack**:" in pr_b_body, f"PR B should now have a formatted stack section, but has: {pr_b_body}"
     
     # Verify the stack structure is correct
     assert f"#{pr_b_num}" in pr_a_body, "Bottom PR A should reference top PR B in its stack"
@@ -2314,27 +2041,24 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     # Save the current commit B hash and commit-id
     b_commit_id = commit_id_match.group(1) if commit_id_match else None
     
-    # Reset to commit A
-    git_cmd.must_git("reset --hard HEAD~1")
-    
-    # Cherry-pick B but without the file_a modification
-    git_cmd.must_git(f"cherry-pick {b_hash} --no-commit")
-    
-    # Reset file_a to remove the modification
-    git_cmd.must_git(f"reset HEAD {a_file}")
-    git_cmd.must_git(f"checkout {a_file}")
-    
     # Commit with preserved commit-id
     if b_commit_id:
         new_independent_msg = f"Add b (now independent) [test-tag:{ctx.tag}]\n\ncommit-id:{b_commit_id}"
     else:
         new_independent_msg = f"Add b (now independent) [test-tag:{ctx.tag}]"
     
-    git_cmd.must_git(f"commit -m {shlex.quote(new_independent_msg)}")
+    # Replace B with a commit on top of A that has the original B's tree: that
+    # is A's tree plus b.txt, without the file_a modification (breakup only
+    # reworded A to add its commit-id). commit-tree writes it straight from
+    # that tree, with no cherry-pick or index round-trips
+    run_cmds(
+        f"new_b=$(git commit-tree {b_hash}^{{tree}} -p HEAD~1 -m {shlex.quote(new_independent_msg)})",
+        'git reset --hard "$new_b"',
+    )
     
     # Step 6: Run breakup --stacks again to update PRs to be independent
     log.info("Step 6: Running breakup --stacks to make PRs independent...")
-    output3 = run_cmd("pyspr breakup --stacks -v")
+    output3 = run_pyspr(["breakup", "--stacks", "-v"])
     log.info(f"Third breakup output:\n{output3}")
     
     # Should now recognize them as independent single-commit components
@@ -2359,15 +2083,9 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     assert pr_a_final, f"PR A #{pr_a_num} should still exist"
     assert pr_b_final, f"PR B #{pr_b_num} should still exist"
     
-    # Re-fetch PR data to get updated bodies
-    if hasattr(ctx.github, 'repo') and ctx.github.repo:
-        gh_pr_a_final = ctx.github.repo.get_pull(pr_a_num)
-        gh_pr_b_final = ctx.github.repo.get_pull(pr_b_num)
-        pr_a_final_body = gh_pr_a_final.body
-        pr_b_final_body = gh_pr_b_final.body
-    else:
-        pr_a_final_body = pr_a_final.body
-        pr_b_final_body = pr_b_final.body
+    # Bodies are as of the search get_test_prs ran after the third breakup
+    pr_a_final_body = pr_a_final.body
+    pr_b_final_body = pr_b_final.body
     
     # Key assertions: PRs should NO LONGER have stack information
     assert "Stack" not in pr_a_final_body, f"PR A should NOT have stack info after becoming independent, but has: {pr_a_final_body}"
@@ -2378,4 +2096,22 @@ def test_breakup_dynamic_structure_with_amends(test_repo_ctx: RepoContext) -> No
     assert pr_b_final.base_ref == "main", f"PR B should target main, but targets {pr_b_final.base_ref}"
     
     log.info("✓ PRs successfully transitioned back to independent")
-    log.info("=== TEST BREAKUP DYNAMIC STRUCTURE WITH AMENDS COMPLETED SUCCESSFULLY ===")
\ No newline at end of file
+    log.info("=== TEST BREAKUP DYNAMIC STRUCTURE WITH AMENDS COMPLETED SUCCESSFULLY ===")
+
+def test_caching_git_sees_ref_updates_from_main_worktree(tmp_path: Path) -> None:
+    """CachingGit in a linked worktree must notice commits made from the main checkout."""
+    main_dir, wt_dir = tmp_path / "main", tmp_path / "wt"
+    main_dir.mkdir()
+    commit = "git -c user.name=Test -c user.email=test@example.com commit -q --allow-empty -m"
+    run_cmds("git init -q -b main", f"{commit} first", f"git worktree add -q -b other {wt_dir}",
+             cwd=str(main_dir))
+    orig_dir = os.getcwd()
+    os.chdir(wt_dir)
+    try:
+        git_cmd = CachingGit(Config({'repo': {}, 'user': {}}))
+        before = git_cmd.short("rev-parse main")
+        run_cmd(f"{commit} second", cwd=str(main_dir))
+        after = git_cmd.short("rev-parse main")
+    finally:
+        os.chdir(orig_dir)
+    assert after != before, "rev-parse main should see the commit made in the main worktree"
@@ -1,18 +1,27 @@
 """Test helpers for e2e tests."""
+import functools
+import io
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import uuid
 import tempfile
 import yaml
 import logging
+import weakref
+from contextlib import redirect_stderr, redirect_stdout
 from dataclasses import dataclass, field
+from pathlib import Path
 import pytest
 from _pytest.fixtures import FixtureRequest
-from typing import Generator, List, Tuple, Optional, Union, Any, Callable, TYPE_CHECKING, Dict
+from typing import Generator, List, Tuple, Optional, Union, Any, Callable, TYPE_CHECKING, Dict, TextIO, TypeVar, cast
 
+from pyspr.cmd.spr.main import run as run_pyspr_cli
 from pyspr.config import Config
-from pyspr.git import RealGit
-from pyspr.github import GitHubClient, PullRequest
+from pyspr.git import CachingGit, RealGit
+from pyspr.github import GitHubClient, GitHubInfo, PullRequest
 
 if TYPE_CHECKING:
     from pyspr.github import GitHubPullRequestProtocol
@@ -22,6 +31,33 @@ import datetime
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Matches the "[test-tag:<tag>]" marker that test commits carry in their message
+TEST_TAG_RE = re.compile(r"\[test-tag:([^\]\s]+)\]")
+
+# get_info results memoized by get_test_prs, per client, as ((cwd, HEAD), info).
+# Anything that may change PRs (a pyspr run, a push, a poll) drops them all;
+# see invalidate_pr_cache.
+_info_cache: "weakref.WeakKeyDictionary[GitHubClient, Tuple[Tuple[str, str], GitHubInfo]]" = weakref.WeakKeyDictionary()
+
+def invalidate_pr_cache() -> None:
+    """Forget PR data memoized by get_test_prs so the next call asks GitHub again."""
+    _info_cache.clear()
+
+# Test repos' CachingGit objects, whose memoized git output goes stale when
+# commands run outside them; see invalidate_git_caches
+_git_cmds: "weakref.WeakSet[CachingGit]" = weakref.WeakSet()
+
+def invalidate_git_caches() -> None:
+    """Forget git output memoized by test repos' CachingGit objects."""
+    for git_cmd in _git_cmds:
+        git_cmd.invalidate()
+
+# Clones of real GitHub repos keyed by (owner, name), made once per test
+# session and copied into each test's tmpdir
+_clone_templates: Dict[Tuple[str, str], str] = {}
+
 @dataclass
 class RepoContext:
     """Test repository context with helpers for test operations."""
@@ -34,18 +70,24 @@ class RepoContext:
     github: GitHubClient
     obj: Dict[str, object] = field(default_factory=dict)  # For protocol compatibility
 
+    def __post_init__(self) -> None:
+        if isinstance(self.git_cmd, CachingGit):
+            _git_cmds.add(self.git_cmd)
+
+    def unique_file(self, file: str) -> str:
+        """Make filename unique by including part of the tag."""
+        tag_suffix = self.tag.split('-')[-1][:8]  # Use last 8 chars of tag
+        return f"{file}.{tag_suffix}" if not file.endswith(tag_suffix) else file
+
     def make_commit(self, file: str, content: str, msg: str) -> str:
         """Create a commit with the test tag embedded."""
         full_msg = f"{msg} [test-tag:{self.tag}]"
-        # Make filename unique by including part of the tag
-        tag_suffix = self.tag.split('-')[-1][:8]  # Use last 8 chars of tag
-        unique_file = f"{file}.{tag_suffix}" if not file.endswith(tag_suffix) else file
+        unique_file = self.unique_file(file)
         full_path = os.path.join(self.repo_dir, unique_file)
         try:
-            with open(full_path, "w") as f:
-                f.write(f"{unique_file}\n{content}\n")
-            run_cmd(f"git add {unique_file}")
-            run_cmd(f'git commit -m "{full_msg}"')
+            Path(full_path).write_bytes(f"{unique_file}\n{content}\n".encode())
+            run_cmds(f"git add {shlex.quote(unique_file)}", f"git commit -m {shlex.quote(full_msg)}",
+                     cwd=self.repo_dir)
             return self.git_cmd.must_git("rev-parse HEAD").strip()
         except subprocess.CalledProcessError as e:
             log.error(f"Commit failed: {e}")
@@ -53,47 +95,52 @@ class RepoContext:
             self.dump_dir_contents()
             raise
 
+    def commit_cmd(self, file: str, content: str, msg: str) -> str:
+        """Shell form of make_commit, for batching with other commands via run_cmds."""
+        unique_file = shlex.quote(self.unique_file(file))
+        return (f"printf '%s\\n%s\\n' {unique_file} {shlex.quote(content)} > {unique_file}"
+                f" && git add {unique_file}"
+                f" && git commit -m {shlex.quote(f'{msg} [test-tag:{self.tag}]')}")
+
+    def make_commits_bulk(self, specs: List[Tuple[str, str, str]]) -> List[str]:
+        """Create one commit per (file, content, msg), same as make_commit in a loop.
+        
+        All commits are written by a single `git fast-import` stream, see
+        fast_import_commits, instead of a `git add` + `git commit` per commit.
+        """
+        commits: List[Tuple[str, Dict[str, str]]] = []
+        for file, content, msg in specs:
+            unique_file = self.unique_file(file)
+            commits.append((f"{msg} [test-tag:{self.tag}]", {unique_file: f"{unique_file}\n{content}\n"}))
+        fast_import_commits(commits, cwd=self.repo_dir)
+        return self.git_cmd.rev_parse_many(*[f"HEAD~{n}" for n in range(len(specs) - 1, 0, -1)], "HEAD")
+
     def get_test_prs(self) -> List[PullRequest]:
         """Get PRs filtered by this test's tag."""
-        result: List[PullRequest] = []
-        log.info(f"Looking for PRs with tag: {self.tag}")
-        
-        # Debug: Check the state of the fake GitHub
-        if hasattr(self.github, 'client') and hasattr(self.github.client, '_repos'):
-            repos = getattr(self.github.client, '_repos', {})
-            for repo_name, repo in repos.items():
-                pulls = getattr(repo, '_pulls', {})
-                log.info(f"Repo {repo_name} has {len(pulls)} PRs")
-                for pr_num, pr in pulls.items():
-                    log.info(f"PR #{pr_num}: {pr.title}")
-        
-        # Otherwise continue with standard approach
-        info = self.github.get_info(None, self.git_cmd)
-        if not info:
-            log.warning("GitHub info is None")
-            return result
-            
-        log.info(f"Found {len(info.pull_requests)} PRs in info")
-        for pr in info.pull_requests:
-            log.info(f"Checking PR #{pr.number} with commit hash {pr.commit.commit_hash}")
-            if pr.from_branch and pr.from_branch.startswith('pyspr/'):
-                try:
-                    # Check the commit message for test tag
-                    commit_msg = self.git_cmd.must_git(f"show -s --format=%B {pr.commit.commit_hash}")
-                    log.info(f"PR #{pr.number} commit message: {commit_msg}")
-                    if f"test-tag:{self.tag}" in commit_msg:
-                        log.info(f"Found PR #{pr.number} with tag '{self.tag}' and commit ID {pr.commit.commit_id}")
-                        result.append(pr)
-                    else:
-                        log.info(f"PR #{pr.number} does not have tag '{self.tag}'")
-                except Exception as e:
-                    log.info(f"Error checking PR #{pr.number}: {e}")
-                    pass
-            else:
-                log.info(f"PR #{pr.number} branch '{pr.from_branch}' doesn't start with 'pyspr/'")
-        
-        log.info(f"Final result: found {len(result)} PRs with tag '{self.tag}'")
-        return result
+        return get_test_prs(self.git_cmd, self.github, self.tag)
+
+    def get_prs_by_tag(self, tag: str) -> List[PullRequest]:
+        """Get PRs whose commit message carries the given test tag."""
+        return get_test_prs(self.git_cmd, self.github, tag)
+
+    def get_prs_by_title_fragment(self, *fragments: str, prs: Optional[List[PullRequest]] = None) -> Dict[str, Optional[PullRequest]]:
+        """Map each title fragment to the first of this test's PRs whose title contains it.
+
+        Pass prs to index an already fetched list instead of querying again.
+        All fragments are matched in one pass over prs, which stops as soon
+        as every fragment has been found.
+        """
+        if prs is None:
+            prs = self.get_test_prs()
+        matches: Dict[str, Optional[PullRequest]] = dict.fromkeys(fragments)
+        remaining = set(fragments)
+        for pr in prs:
+            if not remaining:
+                break
+            for frag in [f for f in remaining if f in pr.title]:
+                matches[frag] = pr
+                remaining.discard(frag)
+        return matches
 
     def dump_git_state(self) -> None:
         """Dump git state for debugging."""
@@ -114,7 +161,7 @@ class RepoContext:
         """Dump directory contents for debugging."""
         try:
             log.info("=== Directory Contents ===")
-            log.info(run_cmd("ls -la", cwd=self.repo_dir))
+            log.info("%s", sorted(os.listdir(self.repo_dir)))
         except Exception as e:
             log.error(f"Failed to dump directory contents: {e}")
 
@@ -167,10 +214,40 @@ class RepoContext:
             self.dump_pr_state()
             raise
 
+def retry(check: Callable[[], Optional[T]], timeout: float = 15.0, initial: float = 0.05,
+          max_wait: float = 1.0) -> Optional[T]:
+    """Call check until it returns something other than None, with exponential backoff.
+    
+    Returns that value, or None if timeout seconds pass first. Cached PR data
+    is dropped before each retry, so checks that go through get_info see
+    changes made since the last attempt.
+    """
+    deadline = time.monotonic() + timeout
+    wait = initial
+    while True:
+        result = check()
+        if result is not None:
+            return result
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(wait)
+        wait = min(wait * 2, max_wait)
+        invalidate_pr_cache()
+
+def wait_for(cond: Callable[[], bool], timeout: float = 10.0, interval: float = 0.2,
+             max_interval: Optional[float] = None) -> bool:
+    """Poll cond until it returns True or timeout seconds pass. Returns the last result.
+    
+    If max_interval is set, the sleep doubles after each miss up to max_interval.
+    """
+    return retry(lambda: True if cond() else None, timeout=timeout, initial=interval,
+                 max_wait=max_interval if max_interval is not None else interval) is not None
+
+@functools.lru_cache(maxsize=1)
 def get_gh_token() -> str:
-    """Get GitHub token from gh CLI config."""
+    """Get GitHub token from gh CLI config, once per session."""
     try:
-        # Need custom run_cmd call since we can't use shell=True with array command
+        # Call subprocess directly so run_cmd doesn't log the token
         token = subprocess.run(
             ['gh', 'auth', 'token'], 
             check=True, 
@@ -196,12 +273,33 @@ def get_gh_token() -> str:
 
     raise Exception("Could not get GitHub token from gh CLI")
 
-def run_cmd(cmd: str, cwd: Optional[str] = None, check: bool = True, 
+def xdist_worker_id() -> str:
+    """Get the pytest-xdist worker running this test ("gw0" when not distributed).
+    
+    Used to namespace test tags and branch names so concurrent workers
+    sharing a real GitHub repo never pick up each other's PRs.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+def _find_project_root() -> Optional[str]:
+    """Find the directory holding pyproject.toml, for running pyspr via rye."""
+    test_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    while test_dir != '/' and test_dir != '':  # Empty check for Windows
+        if os.path.exists(os.path.join(test_dir, 'pyproject.toml')):
+            return test_dir
+        test_dir = os.path.dirname(test_dir)
+    return None
+
+# Project root for rye commands, found once rather than on every run_cmd
+_PROJECT_ROOT = _find_project_root()
+
+def run_cmd(cmd: Union[str, List[str]], cwd: Optional[str] = None, check: bool = True, 
            capture_output: bool = True) -> str:
-    """Run a shell command using subprocess with consistent output capture and logging.
+    """Run a command using subprocess with consistent output capture and logging.
     
     Args:
-        cmd: The command to run
+        cmd: The command to run. A string is split shell-style, but no shell is
+            spawned, so it can't use pipes, redirects or `||`
         cwd: Working directory. If None, uses current directory
         check: If True, raises CalledProcessError on non-zero exit
         capture_output: If True, captures and returns stdout
@@ -212,40 +310,32 @@ def run_cmd(cmd: str, cwd: Optional[str] = None, check: bool = True,
     Raises:
         subprocess.CalledProcessError: If command fails and check=True
     """
-    # Find project root for rye commands
-    project_root = None
-    orig_cwd = os.getcwd()
-    try:
-        # Try to find project root by looking for pyproject.toml
-        test_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        while test_dir != '/' and test_dir != '':  # Empty check for Windows
-            if os.path.exists(os.path.join(test_dir, 'pyproject.toml')):
-                project_root = test_dir
-                break
-            test_dir = os.path.dirname(test_dir)
-    except Exception:
-        pass
-
-    # Replace standalone pyspr command with rye run pyspr from project root
+    # The command may write to the repo, and pyspr runs and pushes may change
+    # PRs, so memoized git output and PR data must be refetched
+    invalidate_git_caches()
+    invalidate_pr_cache()
+    argv = shlex.split(cmd) if isinstance(cmd, str) else cmd
     actual_cwd = cwd
-    if cmd.startswith("pyspr ") or cmd == "pyspr":
+    env = None
+    # Replace standalone pyspr command with rye run pyspr from project root
+    if argv[:1] == ["pyspr"]:
         # Preserve the current SPR_USING_MOCK_GITHUB setting
-        mock_setting = os.environ.get("SPR_USING_MOCK_GITHUB", "true")
-        cmd = f"SPR_USING_MOCK_GITHUB={mock_setting} rye run " + cmd
-        if project_root:
-            actual_cwd = project_root
-            cmd = f"cd {actual_cwd} && {cmd} -C {cwd}" if cwd else f"cd {actual_cwd} && {cmd} -C {orig_cwd}"
+        env = {**os.environ, "SPR_USING_MOCK_GITHUB": os.environ.get("SPR_USING_MOCK_GITHUB", "true")}
+        argv = ["rye", "run", *argv]
+        if _PROJECT_ROOT:
+            argv += ["-C", cwd or os.getcwd()]
+            actual_cwd = _PROJECT_ROOT
         
-    log.info(f"Running command: {cmd}")
+    log.info(f"Running command: {shlex.join(argv)}")
     result = None
     try:
         result = subprocess.run(
-            cmd, 
-            shell=True, 
+            argv, 
             check=check, 
             capture_output=capture_output, 
             text=True, 
-            cwd=actual_cwd
+            cwd=actual_cwd,
+            env=env
         )
         # Always log stdout and stderr
         if result.stdout and result.stdout.strip():
@@ -264,24 +354,183 @@ def run_cmd(cmd: str, cwd: Optional[str] = None, check: bool = True,
         if result and not capture_output:
             return ""  # Return empty string for non-captured output
 
-def get_test_prs(git_cmd: RealGit, github: GitHubClient, unique_tag: str) -> List[PullRequest]:
-    """Get test PRs filtered by unique tag."""
-    log.info(f"Looking for PRs with tag: {unique_tag}")
+def run_cmds(*cmds: str, cwd: Optional[str] = None) -> str:
+    """Run several shell commands in one bash process, stopping at the first failure."""
+    return run_cmd(["bash", "-euo", "pipefail", "-c", " && ".join(cmds)], cwd=cwd)
+
+def run_pyspr(args: List[str], cwd: Optional[str] = None, check: bool = True, merge_stderr: bool = False) -> str:
+    """Run pyspr in this process instead of spawning `rye run pyspr`.
+    
+    Args:
+        args: pyspr arguments, e.g. ["update", "-v"]
+        cwd: Repo directory to run in. If None, uses current directory
+        check: If True, raises CalledProcessError on non-zero exit
+        merge_stderr: If True, include stderr (where pyspr logs) in the output, like `2>&1`
+        
+    Returns:
+        The command's stdout output as string
+    """
+    # pyspr writes to the repo and may change PRs, so memoized git output and
+    # PR data must be refetched
+    invalidate_git_caches()
+    invalidate_pr_cache()
+    
+    # pyspr's setup_logging replaces the root handlers, so put ours back afterwards
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    stdout = io.StringIO()
+    stderr = stdout if merge_stderr else io.StringIO()
+    # pyspr.spr logs through its own handler, bound to sys.stderr at import time
+    spr_handlers = [cast("logging.StreamHandler[TextIO]", h)
+                    for h in logging.getLogger("pyspr.spr").handlers if isinstance(h, logging.StreamHandler)]
+    log.info(f"Running pyspr in-process: {args}")
+    saved_streams = [h.stream for h in spr_handlers]
+    for h in spr_handlers:
+        h.setStream(stderr)
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = run_pyspr_cli(args, cwd=cwd)
+    finally:
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        for h, stream in zip(spr_handlers, saved_streams):
+            h.setStream(stream)
+    
+    out = stdout.getvalue()
+    err = "" if merge_stderr else stderr.getvalue()
+    if out.strip():
+        log.info(f"STDOUT: {out.strip()}")
+    if err.strip():
+        log.info(f"STDERR: {err.strip()}")
+    if check and code != 0:
+        log.error(f"pyspr failed with exit code {code}")
+        raise subprocess.CalledProcessError(code, ["pyspr", *args], out, err)
+    return out
+
+def commit_tag(msg: str) -> Optional[str]:
+    """Return the test tag embedded in a commit message or PR title, if any."""
+    m = TEST_TAG_RE.search(msg)
+    return m.group(1) if m else None
+
+def fast_import_commits(commits: List[Tuple[str, Dict[str, str]]], cwd: Optional[str] = None) -> None:
+    """Create commits on top of the current branch with one `git fast-import` stream.
+    
+    Each entry is (message, {path: new file content}). The index and working
+    tree are then fast-forwarded with `git read-tree`, so the end state matches
+    writing the files and running `git add` + `git commit` for each entry.
+    """
+    branch, old_head, committer = run_cmds(
+        "git symbolic-ref -q HEAD", "git rev-parse HEAD", "git var GIT_COMMITTER_IDENT", cwd=cwd).splitlines()
+    
+    def data(text: str) -> bytes:
+        raw = text.encode()
+        return b"data %d\n" % len(raw) + raw + b"\n"
+    
+    stream = b""
+    for i, (msg, files) in enumerate(commits):
+        stream += f"commit {branch}\ncommitter {committer}\n".encode()
+        stream += data(msg if msg.endswith("\n") else f"{msg}\n")
+        if i == 0:
+            stream += f"from {old_head}\n".encode()
+        for path, content in files.items():
+            stream += f"M 100644 inline {path}\n".encode()
+            stream += data(content)
+    
+    log.info(f"Running git fast-import for {len(commits)} commits on {branch}")
+    subprocess.run(["git", "fast-import", "--quiet"], input=stream, cwd=cwd, check=True, capture_output=True)
+    # Bring index and working tree up to the new tip
+    run_cmd(["git", "read-tree", "-m", "-u", old_head, "HEAD"], cwd=cwd)
+
+def prepend_line(path: str, line: str) -> None:
+    """Insert line at the top of a file, like `echo line | cat - path > tmp && mv tmp path`."""
+    file = Path(path)
+    file.write_bytes(line.encode() + b"\n" + file.read_bytes())
+
+def make_tagged_commit(repo_dir: str, filename: str, message: str, tag: str) -> None:
+    """Create a commit in repo_dir with the given test tag embedded in its message."""
+    full_msg = f"{message} [test-tag:{tag}]"
+    Path(repo_dir, filename).write_bytes(f"{filename}\n{message}\n".encode())
+    run_cmds(f"git add {shlex.quote(filename)}", f"git commit -m {shlex.quote(full_msg)}", cwd=repo_dir)
+
+def get_test_prs(git_cmd: RealGit, github: GitHubClient, *unique_tags: str) -> List[PullRequest]:
+    """Get test PRs filtered by unique tag.
+    
+    PR titles carry the commit subject, tag included, so everything needed
+    comes back from the single GraphQL query behind get_info. Several tags
+    can be given to collect PRs from more than one stack in that one query.
+    The get_info result is memoized per client and HEAD until
+    invalidate_pr_cache, which run_cmd, run_pyspr and retry call.
+    """
+    log.info(f"Looking for PRs with tags: {', '.join(unique_tags)}")
     result: List[PullRequest] = []
-    github_info = github.get_info(None, git_cmd)
+    key = (os.getcwd(), git_cmd.short("rev-parse HEAD"))
+    cached = _info_cache.get(github)
+    if cached is not None and cached[0] == key:
+        github_info: Optional[GitHubInfo] = cached[1]
+    else:
+        github_info = github.get_info(None, git_cmd)
+        if github_info:
+            _info_cache[github] = (key, github_info)
     if not github_info:
         return result
     for pr in github_info.pull_requests:
-        if pr.from_branch and pr.from_branch.startswith('pyspr/'):
-            try:
-                commit_msg = git_cmd.must_git(f"show -s --format=%B {pr.commit.commit_hash}")
-                if f"test-tag:{unique_tag}" in commit_msg:
-                    log.info(f"Found PR #{pr.number} with tag and commit ID {pr.commit.commit_id}")
-                    result.append(pr)
-            except Exception:
-                pass
+        if pr.from_branch and pr.from_branch.startswith('pyspr/') and commit_tag(pr.title) in unique_tags:
+            log.debug("Found PR #%d with tag and commit ID %s", pr.number, pr.commit.commit_id)
+            result.append(pr)
+    log.info(f"Found {len(result)} PRs with tags {', '.join(unique_tags)}")
     return result
 
+def link_or_copy(src: str, dst: str) -> str:
+    """copytree copy_function that shares git objects with the template.
+    
+    Object files are immutable once written, so each test can hardlink them
+    instead of copying. Everything else (refs, index, config, reflogs) is
+    copied because git may append to it in place.
+    """
+    if f"{os.sep}objects{os.sep}" in src:
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+def get_clone_template(owner: str, name: str) -> str:
+    """Get a working clone of a real GitHub repo to copy into each test.
+    
+    The clone is made over SSH on first use and reused for the rest of the
+    session. With SPR_REUSE_CLONE=true it is kept in the user's cache dir,
+    outside the per-session test temp dir, and only fetched in later
+    sessions instead of being cloned again.
+    """
+    key = (owner, name)
+    if key in _clone_templates:
+        return _clone_templates[key]
+    
+    repo_name = f"{owner}/{name}"
+    if os.environ.get("SPR_REUSE_CLONE", "").lower() == "true":
+        cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        tmpdir = os.path.join(cache_dir, "pyspr-tests", f"clone_{owner}_{name}")
+    else:
+        tmpdir = tempfile.mkdtemp(prefix="pyspr_clone_")
+    repo_dir = os.path.join(tmpdir, name)
+    if os.path.isdir(os.path.join(repo_dir, ".git")):
+        log.info(f"Reusing clone of {repo_name} in {tmpdir}")
+        run_cmds("git fetch origin", "git checkout -B main origin/main", cwd=repo_dir)
+    else:
+        log.info(f"Cloning {repo_name} into {tmpdir}")
+        os.makedirs(tmpdir, exist_ok=True)
+        # Clone via SSH to avoid hangs. Tests only commit on top of each branch
+        # tip, so skip history and tags; --no-single-branch keeps the default
+        # refspec so later fetches still see pyspr/* branches
+        run_cmd(f"git clone --depth=1 --no-single-branch --no-tags git@github.com:{repo_name}.git",
+                cwd=tmpdir)
+        run_cmds("git config user.name 'Test User'", "git config user.email 'test@example.com'",
+                 cwd=repo_dir)
+    
+    _clone_templates[key] = repo_dir
+    return repo_dir
+
 def create_repo_context(owner: str, name: str, test_name: str) -> Generator[RepoContext, None, None]:
     """Base fixture factory for creating repo contexts.
     Args:
@@ -292,10 +541,11 @@ def create_repo_context(owner: str, name: str, test_name: str) -> Generator[Repo
     # Always use temp branch for isolation
     orig_dir = os.getcwd()
     test_type = test_name.replace('test_', '')
-    unique_tag = f"test-{test_type}-{uuid.uuid4().hex[:8]}"
+    worker = xdist_worker_id()
+    unique_tag = f"test-{test_type}-{worker}-{uuid.uuid4().hex[:8]}"
     
     repo_name = f"{owner}/{name}"
-    test_branch = f"test-spr-{uuid.uuid4().hex[:7]}" 
+    test_branch = f"test-spr-{worker}-{uuid.uuid4().hex[:7]}"
     log.info(f"Using test branch {test_branch} in {repo_name}")
     
     # Get token
@@ -305,22 +555,17 @@ def create_repo_context(owner: str, name: str, test_name: str) -> Generator[Repo
 
     try:
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chdir(tmpdir)
-            
-            # Clone via SSH to avoid hangs
-            ssh_url = f"git@github.com:{repo_name}.git"
-            run_cmd(f"git clone {ssh_url}")
-            os.chdir(name)
-
-            # Branch setup
-            run_cmd(f"git checkout -b {test_branch}")
-            run_cmd("git checkout -b test_local")  # Local branch for tests
-
-            # Git config
-            run_cmd("git config user.name 'Test User'")
-            run_cmd("git config user.email 'test@example.com'")
-            
-            repo_dir = os.path.abspath(os.getcwd())
+            # Same path getcwd() reports once we're in the repo
+            repo_dir = os.path.realpath(os.path.join(tmpdir, name))
+            # Copy the session's clone instead of cloning again
+            shutil.copytree(get_clone_template(owner, name), repo_dir,
+                            symlinks=True, copy_function=link_or_copy)
+            # Catch up and set up the test branch plus a local branch for tests
+            # in one git session
+            run_cmds("git fetch origin", "git checkout -B main origin/main",
+                     f"git branch {test_branch}", "git checkout -b test_local", cwd=repo_dir)
+            # Tests run their git commands relative to the repo
+            os.chdir(repo_dir)
             
             # Create context objects
             config = Config({
@@ -332,7 +577,7 @@ def create_repo_context(owner: str, name: str, test_name: str) -> Generator[Repo
                 },
                 'user': {}
             })
-            git_cmd = RealGit(config)
+            git_cmd = CachingGit(config)
             # Import here to avoid circular imports
             from pyspr.tests.e2e.mock_setup import create_github_client
             # Create GitHub client - will use real GitHub since SPR_USING_MOCK_GITHUB=false
@@ -351,10 +596,9 @@ def create_repo_context(owner: str, name: str, test_name: str) -> Generator[Repo
             yield ctx
 
             # Cleanup
-            run_cmd("git checkout main")
-            run_cmd(f"git branch -D {test_branch}")
+            run_cmds("git checkout main", f"git branch -D {test_branch}", cwd=repo_dir)
             try:
-                run_cmd(f"git push origin --delete {test_branch}")
+                run_cmd(f"git push origin --delete {test_branch}", cwd=repo_dir)
             except subprocess.CalledProcessError:
                 log.info(f"Failed to delete remote branch {test_branch}, may not exist")
     except Exception as e:
@@ -393,8 +637,7 @@ def create_test_repo(owner: str, name: str) -> Generator[Tuple[str, str, str, st
         Tuple of (owner, name, test_branch, repo_dir)
     """
     orig_dir = os.getcwd()
-    repo_name = f"{owner}/{name}"
-    test_branch = f"test-spr-{uuid.uuid4().hex[:7]}"
+    test_branch = f"test-spr-{xdist_worker_id()}-{uuid.uuid4().hex[:7]}"
 
     # Get token
     token = get_gh_token()
@@ -402,30 +645,24 @@ def create_test_repo(owner: str, name: str) -> Generator[Tuple[str, str, str, st
 
     try:
         with tempfile.TemporaryDirectory() as tmpdir:
-            os.chdir(tmpdir)
-
-            # Clone via SSH to avoid hangs
-            ssh_url = f"git@github.com:{repo_name}.git"
-            run_cmd(f"git clone {ssh_url}")
-            os.chdir(name)
-
-            # Branch setup
-            run_cmd(f"git checkout -b {test_branch}")
-            run_cmd("git checkout -b test_local")  # Local branch for tests
-
-            # Git config
-            run_cmd("git config user.name 'Test User'")
-            run_cmd("git config user.email 'test@example.com'")
-
-            repo_dir = os.path.abspath(os.getcwd())
+            # Same path getcwd() reports once we're in the repo
+            repo_dir = os.path.realpath(os.path.join(tmpdir, name))
+            # Copy the session's clone instead of cloning again
+            shutil.copytree(get_clone_template(owner, name), repo_dir,
+                            symlinks=True, copy_function=link_or_copy)
+            # Catch up and set up the test branch plus a local branch for tests
+            # in one git session
+            run_cmds("git fetch origin", "git checkout -B main origin/main",
+                     f"git branch {test_branch}", "git checkout -b test_local", cwd=repo_dir)
+            # Tests run their git commands relative to the repo
+            os.chdir(repo_dir)
 
             yield owner, name, test_branch, repo_dir
 
             # Cleanup
-            run_cmd("git checkout main")
-            run_cmd(f"git branch -D {test_branch}")
+            run_cmds("git checkout main", f"git branch -D {test_branch}", cwd=repo_dir)
             try:
-                run_cmd(f"git push origin --delete {test_branch}")
+                run_cmd(f"git push origin --delete {test_branch}", cwd=repo_dir)
             except subprocess.CalledProcessError:
                 log.info(f"Failed to delete remote branch {test_branch}, may not exist")
     finally: